@@ -1,12 +1,17 @@
 # browser.py
+import hashlib
+import re
 import socket
 import ssl
 import sys
 import time
-import gzip
+import zlib
 import tkinter
 import tkinter.font
 import urllib.parse  # Chapter 8: for form encoding
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, replace
 from typing import Dict, Optional, Tuple, List, Union
 
@@ -20,9 +25,26 @@ WIDTH, HEIGHT = 800, 600
 MAX_REDIRECTS = 10
 SOFT_HYPHEN = "\N{soft hyphen}"  # U+00AD
 
+# Tag names and attribute keys repeat constantly (a page has ~15 distinct
+# names across thousands of nodes); interning dedups the lowered strings and
+# lets dict lookups take the identity fast path
+_intern = sys.intern
+
+# Entity decoding: one compiled-regex pass instead of chained replace calls
+_ENTITY_RE = re.compile(r"&(lt|gt|amp|shy);")
+_ENTITIES = {"lt": "<", "gt": ">", "amp": "&", "shy": SOFT_HYPHEN}
+
+# One TLS context for all connections; create_default_context() re-reads and
+# re-parses the system CA bundle on every call
+_SSL_CTX = ssl.create_default_context()
+
 # Chapter 8: Input width
 INPUT_WIDTH_PX = 200
 
+# Opt-in optimal-fit (least-badness) paragraph breaking. Off by default:
+# greedy first-fit matches the book; flip on for more even right margins.
+OPTIMAL_LINE_BREAKS = False
+
 # -----------------------
 # Chapter 5: block elements
 # -----------------------
@@ -349,6 +371,10 @@ class URL:
 # ============================================================
 
 class Node:
+    # Per-instance dicts dominate DOM memory on real pages; slots shrink each
+    # node and speed attribute access
+    __slots__ = ("parent", "children", "style", "is_focused")
+
     def __init__(self, parent: Optional["Element"]):
         self.parent = parent
         self.children: List["Node"] = []
@@ -357,19 +383,42 @@ class Node:
 
 
 class Text(Node):
+    __slots__ = ("text", "_words", "_intrinsic")
+
     def __init__(self, text: str, parent: Optional["Element"]):
         super().__init__(parent)
         self.text = text
+        self._words: Optional[List[str]] = None  # cached text.split()
+        # (style key, font, [(word, width), ...]) - width-independent layout
+        # inputs, cached until the node's font context changes
+        self._intrinsic: Optional[Tuple] = None
 
     def __repr__(self) -> str:
         return repr(self.text)
 
 
 class Element(Node):
-    def __init__(self, tag: str, attributes: Dict[str, str], parent: Optional["Element"]):
+    __slots__ = ("tag", "_attributes", "_raw_attrs")
+
+    def __init__(self, tag: str, attributes: Union[Dict[str, str], str],
+                 parent: Optional["Element"]):
         super().__init__(parent)
         self.tag = tag
-        self.attributes = attributes
+        # The parser hands us the raw attribute text; it is only parsed when
+        # someone actually reads .attributes. Layout-only passes never pay for
+        # attribute parsing. A ready-made dict is also accepted.
+        if isinstance(attributes, str):
+            self._attributes: Optional[Dict[str, str]] = None
+            self._raw_attrs = attributes
+        else:
+            self._attributes = attributes
+            self._raw_attrs = ""
+
+    @property
+    def attributes(self) -> Dict[str, str]:
+        if self._attributes is None:
+            self._attributes = HTMLParser.parse_attributes(self._raw_attrs)
+        return self._attributes
 
     def __repr__(self) -> str:
         return "<" + self.tag + ">"
@@ -398,157 +447,154 @@ class HTMLParser:
         "link", "meta", "title", "style", "script",
     }
 
-    def __init__(self, body: str):
+    def __init__(self, body: str) -> None:
         self.body = body
         self.unfinished: List[Element] = []
+        # Lowercased body for case-insensitive </script>/</style> search,
+        # computed at most once instead of per script/style tag
+        self._lower: Optional[str] = None
 
     def parse(self) -> Element:
         i = 0
-        text = ""
-
-        while i < len(self.body):
-            if self.body.startswith("<!--", i):
-                if text:
-                    self.add_text(text)
-                    text = ""
-                end = self.body.find("-->", i + 4)
+        body = self.body
+        n = len(body)
+
+        while i < n:
+            # Jump straight to the next tag start; find runs at C speed over
+            # the plain-text bytes instead of a Python branch per character
+            lt = body.find("<", i)
+            if lt == -1:
+                # No more tags: the rest is one text run
+                self.add_text(body[i:])
+                return self.finish()
+            if lt > i:
+                self.add_text(body[i:lt])
+            i = lt
+
+            if body.startswith("<!--", i):
+                end = body.find("-->", i + 4)
                 if end == -1:
                     return self.finish()
                 i = end + 3
                 continue
 
-            if self.body[i] == "<":
-                if text:
-                    self.add_text(text)
-                    text = ""
-
-                if self.body.startswith("<script", i) or self.body.startswith("<style", i):
-                    tag_end = self.body.find(">", i)
-                    tag_text = self.body[i + 1 : tag_end]
-                    tag, attrs = self.get_attributes(tag_text)
-                    self.add_tag(tag_text)
-
-                    close = f"</{tag}>"
-                    end = self.body.lower().find(close, tag_end)
-                    if end == -1:
-                        return self.finish()
-
-                    raw = self.body[tag_end + 1 : end]
-                    self.add_text(raw)
-                    self.add_tag(f"/{tag}")
-                    i = end + len(close)
-                    continue
+            if body.startswith("<script", i) or body.startswith("<style", i):
+                tag_end = body.find(">", i)
+                tag_text = body[i + 1 : tag_end]
+                tag = tag_text.split(None, 1)[0].lower()
+                self.add_tag(tag_text)
 
-                j = self.body.find(">", i)
-                if j == -1:
-                    break
-                self.add_tag(self.body[i + 1 : j])
-                i = j + 1
-            else:
-                text += self.body[i]
-                i += 1
+                close = f"</{tag}>"
+                if self._lower is None:
+                    self._lower = body.lower()
+                end = self._lower.find(close, tag_end)
+                if end == -1:
+                    return self.finish()
+
+                raw = body[tag_end + 1 : end]
+                self.add_text(raw)
+                self.add_tag(f"/{tag}")
+                i = end + len(close)
+                continue
+
+            j = body.find(">", i)
+            if j == -1:
+                # Unterminated tag at EOF: drop it, like before
+                return self.finish()
+            self.add_tag(body[i + 1 : j])
+            i = j + 1
 
-        if text:
-            self.add_text(text)
         return self.finish()
 
-    def get_attributes(self, text: str):
+    # One C-level regex pass per tag: key, then optionally =value where value
+    # is double-quoted, single-quoted or bare
+    ATTR_RE = re.compile(r'([\w:-]+)\s*(?:=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]*)))?')
+
+    @staticmethod
+    def parse_attributes(rest: str) -> Dict[str, str]:
+        attrs = {}
+        for m in HTMLParser.ATTR_RE.finditer(rest):
+            key = _intern(m.group(1).lower())
+            val = m.group(2)
+            if val is None:
+                val = m.group(3)
+            if val is None:
+                val = m.group(4) or ""
+            attrs[key] = val
+        return attrs
+
+    @staticmethod
+    def get_attributes(text: str) -> Tuple[str, Dict[str, str]]:
         parts = text.split(None, 1)
         if not parts:
             return "", {}
-        tag = parts[0].lower()
+        tag = _intern(parts[0].lower())
         rest = parts[1] if len(parts) > 1 else ""
-        n = len(rest)
-
-        attrs = {}
-        i = 0
-        while True:
-            while i < n and rest[i].isspace():
-                i += 1
-            if i >= n:
-                break
-
-            if not (rest[i].isalnum() or rest[i] in "-_:"):
-                i += 1
-                continue
-
-            key_start = i
-            while i < n and (rest[i].isalnum() or rest[i] in "-_:"):
-                i += 1
-            key = rest[key_start:i].lower()
-
-            while i < n and rest[i].isspace():
-                i += 1
-
-            val = ""
-            if i < n and rest[i] == "=":
-                i += 1
-                while i < n and rest[i].isspace():
-                    i += 1
-                if i < n and rest[i] in "\"'":
-                    q = rest[i]
-                    i += 1
-                    val_start = i
-                    while i < n and rest[i] != q:
-                        i += 1
-                    val = rest[val_start:i]
-                    if i < n:
-                        i += 1
-                else:
-                    val_start = i
-                    while i < n and not rest[i].isspace() and rest[i] != ">":
-                        i += 1
-                    val = rest[val_start:i]
-
-            if key:
-                attrs[key] = val
-        return tag, attrs
+        return tag, HTMLParser.parse_attributes(rest)
 
-    def add_text(self, text: str):
+    def add_text(self, text: str) -> None:
         if not text.strip():
             return
         self.implicit_tags(None)
         parent = self.unfinished[-1]
         parent.children.append(Text(text, parent))
 
-    def add_tag(self, text: str):
+    def add_tag(self, text: str) -> None:
         if text.startswith("!"):
             return
-        tag, attrs = self.get_attributes(text)
+        # Only the tag name is needed here; the attribute text is handed to
+        # the Element as-is and parsed lazily on first .attributes access
+        parts = text.split(None, 1)
+        tag = _intern(parts[0].lower()) if parts else ""
+        raw_attrs = parts[1] if len(parts) > 1 else ""
         self.implicit_tags(tag)
 
+        # close tags short-circuit before the action table
         if tag.startswith("/"):
-            name = tag[1:]
-            for i in range(len(self.unfinished) - 1, 0, -1):
-                if self.unfinished[i].tag == name:
-                    node = self.unfinished[i]
-                    del self.unfinished[i:]
-                    self.unfinished[-1].children.append(node)
-                    return
+            self._close_element(tag[1:])
             return
 
-        if tag in self.SELF_CLOSING_TAGS:
-            parent = self.unfinished[-1]
-            parent.children.append(Element(tag, attrs, parent))
-            return
+        action = self.TAG_ACTIONS.get(tag, HTMLParser._open_element)
+        action(self, tag, raw_attrs)
+
+    def _close_element(self, name: str) -> None:
+        unfinished = self.unfinished
+        for i in range(len(unfinished) - 1, 0, -1):
+            if unfinished[i].tag == name:
+                # Pop one at a time instead of a slice delete so the list
+                # shrinks with amortized O(1) reallocs; misnested elements
+                # above the match are discarded, as before
+                while len(unfinished) > i + 1:
+                    unfinished.pop()
+                node = unfinished.pop()
+                unfinished[-1].children.append(node)
+                return
 
+    def _self_closing_element(self, tag: str, raw_attrs: str) -> None:
         parent = self.unfinished[-1]
-        self.unfinished.append(Element(tag, attrs, parent))
+        parent.children.append(Element(tag, raw_attrs, parent))
 
-    def implicit_tags(self, tag):
-        while True:
-            open_tags = [n.tag for n in self.unfinished]
+    def _open_element(self, tag: str, raw_attrs: str) -> None:
+        parent = self.unfinished[-1]
+        self.unfinished.append(Element(tag, raw_attrs, parent))
 
-            if not open_tags:
+    # Precomputed tag -> handler table; built once so add_tag does a single
+    # dict lookup instead of a membership-test cascade per tag
+    TAG_ACTIONS = dict.fromkeys(SELF_CLOSING_TAGS, _self_closing_element)
+
+    def implicit_tags(self, tag: Optional[str]) -> None:
+        # The decisions only depend on the bottom of the stack, so peek at it
+        # directly instead of rebuilding a list of open tags on every call
+        while True:
+            n = len(self.unfinished)
+            if n == 0:
                 self.unfinished.append(Element("html", {}, None))
-            elif open_tags == ["html"]:
+            elif n == 1 and self.unfinished[0].tag == "html":
                 self.unfinished.append(Element("body", {}, self.unfinished[-1]))
-            elif open_tags == ["html", "body"]:
-                break
             else:
                 break
 
-    def finish(self):
+    def finish(self) -> Element:
         if not self.unfinished:
             self.implicit_tags(None)
         while len(self.unfinished) > 1:
@@ -561,16 +607,101 @@ class HTMLParser:
 # Fonts
 # ============================================================
 
-FONTS: Dict[Tuple[int, str, str, str], Tuple[tkinter.font.Font, tkinter.Label]] = {}
+# LRU rather than an unbounded dict: a long session across sites with many
+# font sizes would otherwise grow this (and every id(font)-keyed side cache)
+# forever. Not functools.lru_cache, because eviction must also purge the
+# dependent caches - an evicted font can be garbage collected and its id
+# reused, which would silently corrupt SPACE_WIDTHS/FONT_METRICS/MEASURE_CACHE.
+FONTS: "OrderedDict[Tuple[int, str, str, str], tkinter.font.Font]" = OrderedDict()
+_FONTS_MAX = 256
+
+# Canonical display names for the families the default styles use; anything
+# else is passed through stripped, with the casefolded form as the cache key
+_FAMILY_CANON = {
+    "times": "Times",
+    "courier": "Courier",
+    "courier new": "Courier New",
+    "helvetica": "Helvetica",
+    "arial": "Arial",
+}
 
 
 def get_font(size: int, weight: str, slant: str, family: str = "Times") -> tkinter.font.Font:
-    key = (size, weight, slant, family)
-    if key not in FONTS:
-        font = tkinter.font.Font(size=size, weight=weight, slant=slant, family=family)
-        label = tkinter.Label(font=font)
-        FONTS[key] = (font, label)
-    return FONTS[key][0]
+    # Normalize the key: "Times" vs "times" or stray whitespace in a style
+    # value must not allocate a second identical Tk font (font creation can
+    # trigger system font-cache work, and every font pins its metric caches)
+    family = family.strip()
+    family_cf = family.casefold()
+    key = (size, weight.casefold(), slant.casefold(), family_cf)
+    font = FONTS.get(key)
+    if font is None:
+        # The cache itself keeps the Font object alive; the tkinter.Label the
+        # book uses for that purpose is an unnecessary widget per font
+        font = tkinter.font.Font(size=size, weight=key[1], slant=key[2],
+                                 family=_FAMILY_CANON.get(family_cf, family))
+        FONTS[key] = font
+        if len(FONTS) > _FONTS_MAX:
+            _, evicted = FONTS.popitem(last=False)
+            _purge_font_caches(evicted)
+    else:
+        FONTS.move_to_end(key)
+    return font
+
+
+def _purge_font_caches(font: tkinter.font.Font) -> None:
+    fid = id(font)
+    SPACE_WIDTHS.pop(fid, None)
+    FONT_METRICS.pop(fid, None)
+    for k in [k for k in MEASURE_CACHE if k[0] == fid]:
+        del MEASURE_CACHE[k]
+
+
+# Space width per font, measured once instead of per word in the layout hot path.
+# Keyed by id(font): Font defines __eq__ without __hash__, so Font objects are
+# unhashable; ids are stable because the FONTS cache keeps every font alive.
+SPACE_WIDTHS: Dict[int, int] = {}
+
+
+def get_space_width(font: tkinter.font.Font) -> int:
+    w = SPACE_WIDTHS.get(id(font))
+    if w is None:
+        w = font.measure(" ")
+        SPACE_WIDTHS[id(font)] = w
+    return w
+
+
+# (font, word) -> pixel width. font.measure is a Tcl round-trip and layout
+# measures the same word in BlockLayout.word and again in TextLayout.layout,
+# plus prose repeats words constantly; the cache collapses all of that to one
+# real measurement per unique (font, word) pair.
+MEASURE_CACHE: Dict[Tuple[int, str], int] = {}
+_MEASURE_CACHE_MAX = 8192
+
+
+def measure(font: tkinter.font.Font, text: str) -> int:
+    key = (id(font), text)
+    w = MEASURE_CACHE.get(key)
+    if w is None:
+        if len(MEASURE_CACHE) >= _MEASURE_CACHE_MAX:
+            # Wholesale reset is cheaper than per-hit LRU bookkeeping in the
+            # hottest loop; a page rarely has this many unique words anyway
+            MEASURE_CACHE.clear()
+        w = MEASURE_CACHE[key] = font.measure(text)
+    return w
+
+
+# id(font) -> (ascent, descent, linespace). metrics() is another Tcl round-trip
+# returning constants for a given font, yet line layout asked for them per
+# child per line and DrawText per display item; one call per unique font does.
+FONT_METRICS: Dict[int, Tuple[int, int, int]] = {}
+
+
+def font_metrics(font: tkinter.font.Font) -> Tuple[int, int, int]:
+    fm = FONT_METRICS.get(id(font))
+    if fm is None:
+        m = font.metrics()
+        fm = FONT_METRICS[id(font)] = (m["ascent"], m["descent"], m["linespace"])
+    return fm
 
 
 # ============================================================
@@ -613,6 +744,8 @@ def parse_font_style(style_str: str) -> str:
 # ============================================================
 
 class Rect:
+    __slots__ = ("left", "top", "right", "bottom")
+
     def __init__(self, left: float, top: float, right: float, bottom: float):
         self.left = left
         self.top = top
@@ -629,8 +762,10 @@ class Rect:
 # ============================================================
 
 class DrawText:
+    __slots__ = ("rect", "text", "font", "color")
+
     def __init__(self, x1: float, y1: float, text: str, font: tkinter.font.Font, color: str):
-        self.rect = Rect(x1, y1, x1 + font.measure(text), y1 + font.metrics("linespace"))
+        self.rect = Rect(x1, y1, x1 + measure(font, text), y1 + font_metrics(font)[2])
         self.text = text
         self.font = font
         self.color = color
@@ -644,20 +779,33 @@ class DrawText:
         return self.rect.bottom
 
     def execute(self, scroll: float, canvas: tkinter.Canvas) -> None:
+        self.create(canvas, scroll)
+
+    def create(self, canvas: tkinter.Canvas, scroll: float) -> int:
         color = self.color if self.color and not self.color.startswith("var") else "black"
         try:
-            canvas.create_text(
+            return canvas.create_text(
                 self.rect.left, self.rect.top - scroll,
                 text=self.text, font=self.font, anchor="nw", fill=color
             )
         except tkinter.TclError:
-            canvas.create_text(
+            return canvas.create_text(
                 self.rect.left, self.rect.top - scroll,
                 text=self.text, font=self.font, anchor="nw", fill="black"
             )
 
+    def update(self, canvas: tkinter.Canvas, item: int, scroll: float) -> None:
+        color = self.color if self.color and not self.color.startswith("var") else "black"
+        canvas.coords(item, self.rect.left, self.rect.top - scroll)
+        try:
+            canvas.itemconfigure(item, text=self.text, font=self.font, fill=color)
+        except tkinter.TclError:
+            canvas.itemconfigure(item, text=self.text, font=self.font, fill="black")
+
 
 class DrawRect:
+    __slots__ = ("rect", "color")
+
     def __init__(self, rect: Rect, color: str):
         self.rect = rect
         self.color = color
@@ -671,19 +819,41 @@ class DrawRect:
         return self.rect.bottom
 
     def execute(self, scroll: float, canvas: tkinter.Canvas) -> None:
-        if not self.color or self.color.startswith("var"):
-            return
+        self.create(canvas, scroll)
+
+    def create(self, canvas: tkinter.Canvas, scroll: float) -> int:
+        # Unknown colors become an invisible (unfilled) rectangle so the
+        # retained item list stays aligned with the display list
+        fill = self.color if self.color and not self.color.startswith("var") else ""
         try:
-            canvas.create_rectangle(
+            return canvas.create_rectangle(
                 self.rect.left, self.rect.top - scroll,
                 self.rect.right, self.rect.bottom - scroll,
-                width=0, fill=self.color
+                width=0, fill=fill
             )
         except tkinter.TclError:
-            pass
+            return canvas.create_rectangle(
+                self.rect.left, self.rect.top - scroll,
+                self.rect.right, self.rect.bottom - scroll,
+                width=0, fill=""
+            )
+
+    def update(self, canvas: tkinter.Canvas, item: int, scroll: float) -> None:
+        fill = self.color if self.color and not self.color.startswith("var") else ""
+        canvas.coords(
+            item,
+            self.rect.left, self.rect.top - scroll,
+            self.rect.right, self.rect.bottom - scroll,
+        )
+        try:
+            canvas.itemconfigure(item, fill=fill)
+        except tkinter.TclError:
+            canvas.itemconfigure(item, fill="")
 
 
 class DrawLine:
+    __slots__ = ("rect", "color", "thickness")
+
     def __init__(self, x1: float, y1: float, x2: float, y2: float, color: str, thickness: int):
         self.rect = Rect(x1, y1, x2, y2)
         self.color = color
@@ -698,18 +868,39 @@ class DrawLine:
         return self.rect.bottom
 
     def execute(self, scroll: float, canvas: tkinter.Canvas) -> None:
+        self.create(canvas, scroll)
+
+    def create(self, canvas: tkinter.Canvas, scroll: float) -> int:
         color = self.color if self.color and not self.color.startswith("var") else "black"
         try:
-            canvas.create_line(
+            return canvas.create_line(
                 self.rect.left, self.rect.top - scroll,
                 self.rect.right, self.rect.bottom - scroll,
                 fill=color, width=self.thickness
             )
         except tkinter.TclError:
-            pass
+            return canvas.create_line(
+                self.rect.left, self.rect.top - scroll,
+                self.rect.right, self.rect.bottom - scroll,
+                fill="black", width=self.thickness
+            )
+
+    def update(self, canvas: tkinter.Canvas, item: int, scroll: float) -> None:
+        color = self.color if self.color and not self.color.startswith("var") else "black"
+        canvas.coords(
+            item,
+            self.rect.left, self.rect.top - scroll,
+            self.rect.right, self.rect.bottom - scroll,
+        )
+        try:
+            canvas.itemconfigure(item, fill=color, width=self.thickness)
+        except tkinter.TclError:
+            canvas.itemconfigure(item, fill="black", width=self.thickness)
 
 
 class DrawOutline:
+    __slots__ = ("rect", "color", "thickness")
+
     def __init__(self, rect: Rect, color: str, thickness: int):
         self.rect = rect
         self.color = color
@@ -724,15 +915,46 @@ class DrawOutline:
         return self.rect.bottom
 
     def execute(self, scroll: float, canvas: tkinter.Canvas) -> None:
+        self.create(canvas, scroll)
+
+    def create(self, canvas: tkinter.Canvas, scroll: float) -> int:
         color = self.color if self.color and not self.color.startswith("var") else "black"
         try:
-            canvas.create_rectangle(
+            return canvas.create_rectangle(
                 self.rect.left, self.rect.top - scroll,
                 self.rect.right, self.rect.bottom - scroll,
                 width=self.thickness, outline=color
             )
         except tkinter.TclError:
-            pass
+            return canvas.create_rectangle(
+                self.rect.left, self.rect.top - scroll,
+                self.rect.right, self.rect.bottom - scroll,
+                width=self.thickness, outline="black"
+            )
+
+    def update(self, canvas: tkinter.Canvas, item: int, scroll: float) -> None:
+        color = self.color if self.color and not self.color.startswith("var") else "black"
+        canvas.coords(
+            item,
+            self.rect.left, self.rect.top - scroll,
+            self.rect.right, self.rect.bottom - scroll,
+        )
+        try:
+            canvas.itemconfigure(item, outline=color, width=self.thickness)
+        except tkinter.TclError:
+            canvas.itemconfigure(item, outline="black", width=self.thickness)
+
+
+def tcl_quote(s: str) -> str:
+    """Quote a string as a single Tcl word (for generated canvas scripts).
+
+    Uses double-quoting with backslash escapes: inside braces Tcl performs
+    no backslash substitution, so brace-quoting cannot represent text that
+    itself contains braces or backslashes.
+    """
+    escaped = (s.replace("\\", "\\\\").replace('"', '\\"')
+                .replace("$", "\\$").replace("[", "\\[").replace("]", "\\]"))
+    return '"' + escaped + '"'
 
 
 # ============================================================
@@ -740,7 +962,8 @@ class DrawOutline:
 # ============================================================
 
 class InputLayout:
-    def __init__(self, node: Element, parent: "LineLayout", previous):
+    def __init__(self, node: Element, parent: "LineLayout", previous,
+                 font: Optional[tkinter.font.Font] = None):
         self.node = node
         self.children: List = []
         self.parent = parent
@@ -749,26 +972,30 @@ class InputLayout:
         self.y: float = 0
         self.width: float = INPUT_WIDTH_PX
         self.height: float = 0
-        self.font: Optional[tkinter.font.Font] = None
+        self.font: Optional[tkinter.font.Font] = font
+        self.ascent: int = 0  # filled in by BlockLayout.input at push time
 
     def layout(self) -> None:
-        weight = parse_font_weight(self.node.style.get("font-weight", "normal"))
-        style_val = parse_font_style(self.node.style.get("font-style", "normal"))
-        size = parse_font_size(self.node.style.get("font-size", "16px"))
-        family = self.node.style.get("font-family", "Times")
-        if family.startswith("var"):
-            family = "Times"
-        self.font = get_font(size, weight, style_val, family)
+        if self.font is None:
+            weight = parse_font_weight(self.node.style.get("font-weight", "normal"))
+            style_val = parse_font_style(self.node.style.get("font-style", "normal"))
+            size = parse_font_size(self.node.style.get("font-size", "16px"))
+            family = self.node.style.get("font-family", "Times")
+            if family.startswith("var"):
+                family = "Times"
+            self.font = get_font(size, weight, style_val, family)
+        if not self.ascent:
+            self.ascent = font_metrics(self.font)[0]
 
         self.width = INPUT_WIDTH_PX
 
         if self.previous:
-            space = self.previous.font.measure(" ")
+            space = get_space_width(self.previous.font)
             self.x = self.previous.x + space + self.previous.width
         else:
             self.x = self.parent.x
 
-        self.height = self.font.metrics("linespace")
+        self.height = font_metrics(self.font)[2]
 
     def should_paint(self) -> bool:
         return True
@@ -800,7 +1027,7 @@ class InputLayout:
 
         # Cursor for focused input
         if self.node.is_focused:
-            cx = self.x + self.font.measure(text)
+            cx = self.x + measure(self.font, text)
             cmds.append(DrawLine(cx, self.y, cx, self.y + self.height, "black", 1))
 
         return cmds
@@ -811,7 +1038,8 @@ class InputLayout:
 # ============================================================
 
 class TextLayout:
-    def __init__(self, node: Node, word: str, parent: "LineLayout", previous: Optional["TextLayout"]):
+    def __init__(self, node: Node, word: str, parent: "LineLayout", previous: Optional["TextLayout"],
+                 font: Optional[tkinter.font.Font] = None, width: Optional[float] = None):
         self.node = node
         self.word = word
         self.children: List = []
@@ -819,28 +1047,33 @@ class TextLayout:
         self.previous = previous
         self.x: float = 0
         self.y: float = 0
-        self.width: float = 0
+        # BlockLayout.word already resolved the font and measured the word to
+        # pick a line break; accept both so layout() doesn't redo that work
+        self.width: float = width if width is not None else 0
         self.height: float = 0
-        self.font: Optional[tkinter.font.Font] = None
+        self.font: Optional[tkinter.font.Font] = font
+        self.ascent: int = 0  # filled in by BlockLayout.word at push time
 
     def layout(self) -> None:
-        weight = parse_font_weight(self.node.style.get("font-weight", "normal"))
-        style_val = parse_font_style(self.node.style.get("font-style", "normal"))
-        size = parse_font_size(self.node.style.get("font-size", "16px"))
-        family = self.node.style.get("font-family", "Times")
-        if family.startswith("var"):
-            family = "Times"
-        self.font = get_font(size, weight, style_val, family)
-
-        self.width = self.font.measure(self.word)
+        if self.font is None:
+            weight = parse_font_weight(self.node.style.get("font-weight", "normal"))
+            style_val = parse_font_style(self.node.style.get("font-style", "normal"))
+            size = parse_font_size(self.node.style.get("font-size", "16px"))
+            family = self.node.style.get("font-family", "Times")
+            if family.startswith("var"):
+                family = "Times"
+            self.font = get_font(size, weight, style_val, family)
+            self.width = measure(self.font, self.word)
+        if not self.ascent:
+            self.ascent = font_metrics(self.font)[0]
 
         if self.previous:
-            space = self.previous.font.measure(" ")
+            space = get_space_width(self.previous.font)
             self.x = self.previous.x + space + self.previous.width
         else:
             self.x = self.parent.x
 
-        self.height = self.font.metrics("linespace")
+        self.height = font_metrics(self.font)[2]
 
     def should_paint(self) -> bool:
         return True
@@ -864,6 +1097,10 @@ class LineLayout:
         self.y: float = 0
         self.width: float = 0
         self.height: float = 0
+        # Running maxima, updated as BlockLayout pushes items onto the line;
+        # by layout() time the baseline is already known without a walk
+        self.max_ascent: int = 0
+        self.max_descent: int = 0
 
     def layout(self) -> None:
         self.width = self.parent.width
@@ -874,19 +1111,18 @@ class LineLayout:
         else:
             self.y = self.parent.y
 
-        for child in self.children:
-            child.layout()
-
         if not self.children:
             self.height = 0
             return
 
-        max_ascent = max([child.font.metrics("ascent") for child in self.children])
-        baseline = self.y + 1.25 * max_ascent
+        # The ascent/descent maxima were accumulated while items were pushed,
+        # so sizing and placement happen in the same single walk that lays
+        # out each child - no separate metrics pass over the line at all
+        baseline = self.y + 1.25 * self.max_ascent
         for child in self.children:
-            child.y = baseline - child.font.metrics("ascent")
-        max_descent = max([child.font.metrics("descent") for child in self.children])
-        self.height = 1.25 * (max_ascent + max_descent)
+            child.layout()
+            child.y = baseline - child.ascent
+        self.height = 1.25 * (self.max_ascent + self.max_descent)
 
     def should_paint(self) -> bool:
         return True
@@ -939,6 +1175,8 @@ class BlockLayout:
         self.width: float = 0
         self.height: float = 0
         self.cursor_x: float = 0
+        # Staging buffer for optimal-fit mode; None means greedy placement
+        self._pending: Optional[List[Tuple[Node, str, tkinter.font.Font, float]]] = None
 
     def layout_mode(self) -> str:
         if isinstance(self.node, Text):
@@ -973,28 +1211,80 @@ class BlockLayout:
                 previous = next_block
         else:
             self.cursor_x = 0
+            if OPTIMAL_LINE_BREAKS:
+                self._pending = []
             self.new_line()
             self.recurse(self.node)
+            if self._pending:
+                self._flush_pending()
 
         for child in self.children:
             child.layout()
 
         self.height = sum([child.height for child in self.children])
 
-    def recurse(self, node: Node) -> None:
-        if isinstance(node, Text):
-            for word in node.text.split():
-                self.word(node, word)
-        else:
-            if node.tag == "br":
-                self.new_line()
-            elif node.tag == "input" or node.tag == "button":
-                self.input(node)
+    def recurse(self, tree: Node) -> None:
+        # Explicit stack instead of recursion: no frame per DOM node and no
+        # recursion limit on deeply nested HTML
+        handlers = BlockLayout.TAG_HANDLERS
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Text):
+                font, pairs = self._text_intrinsics(node)
+                if self._pending is not None:
+                    for word, w in pairs:
+                        self._pending.append((node, word, font, w))
+                    continue
+                space = get_space_width(font)
+                for word, w in pairs:
+                    if self.cursor_x + w > self.width:
+                        self.new_line()
+                    self._append_text(node, word, font, w)
+                    self.cursor_x += w + space
+                continue
+            handler = handlers.get(node.tag)
+            if handler is not None:
+                handler(self, node)
             else:
-                for child in node.children:
-                    self.recurse(child)
+                # reversed so children are visited in document order
+                stack.extend(reversed(node.children))
+
+    def _br(self, node: Element) -> None:
+        self.new_line()
+
+    def _text_intrinsics(self, node: Text):
+        """Per-node font + (word, width) list, width-independent.
+
+        Resolving style and measuring words depends only on the node's font
+        context, not on the available width, so resizes reuse the cached
+        list wholesale and only the line-break decisions are recomputed.
+        The cache self-invalidates when a restyle changes the font fields.
+        """
+        style = node.style
+        key = (style.get("font-weight", "normal"),
+               style.get("font-style", "normal"),
+               style.get("font-size", "16px"),
+               style.get("font-family", "Times"))
+        cached = node._intrinsic
+        if cached is not None and cached[0] == key:
+            return cached[1], cached[2]
+        family = key[3]
+        if family.startswith("var"):
+            family = "Times"
+        font = get_font(parse_font_size(key[2]), parse_font_weight(key[0]),
+                        parse_font_style(key[1]), family)
+        words = node._words
+        if words is None:
+            words = node._words = node.text.split()
+        pairs = [(word, measure(font, word)) for word in words]
+        node._intrinsic = (key, font, pairs)
+        return font, pairs
 
     def new_line(self) -> None:
+        # A forced break (<br>, start of block) ends the staged paragraph
+        if self._pending:
+            self._flush_pending()
         self.cursor_x = 0
         last_line = self.children[-1] if self.children else None
         new_line = LineLayout(self.node, self, last_line)
@@ -1009,25 +1299,89 @@ class BlockLayout:
             family = "Times"
         font = get_font(size, weight, style_val, family)
 
-        w = font.measure(word)
+        w = measure(font, word)
+        if self._pending is not None:
+            # Optimal-fit mode: stage the word, break the paragraph later
+            self._pending.append((node, word, font, w))
+            return
         if self.cursor_x + w > self.width:
             self.new_line()
+        self._append_text(node, word, font, w)
+        self.cursor_x += w + get_space_width(font)
+
+    def _append_text(self, node: Node, word: str,
+                     font: tkinter.font.Font, w: float) -> None:
         line = self.children[-1]
         previous_word = line.children[-1] if line.children else None
-        text = TextLayout(node, word, line, previous_word)
+        text = TextLayout(node, word, line, previous_word, font=font, width=w)
+        a, d, _ = font_metrics(font)
+        text.ascent = a
+        if a > line.max_ascent:
+            line.max_ascent = a
+        if d > line.max_descent:
+            line.max_descent = d
         line.children.append(text)
-        self.cursor_x += w + font.measure(" ")
+
+    def _flush_pending(self) -> None:
+        """Optimal-fit break of the staged paragraph (Eppstein-style DP).
+
+        Minimizes the sum over non-final lines of (target - line_width)^2,
+        reusing the already-measured word widths; the last line rags for
+        free, and a single over-wide word is placed on its own line.
+        """
+        items, self._pending = self._pending, []
+        target = self.width
+        n = len(items)
+        # Cumulative word and trailing-space widths -> O(1) line width
+        cum_w = [0.0]
+        cum_s = [0.0]
+        for _, _, font, w in items:
+            cum_w.append(cum_w[-1] + w)
+            cum_s.append(cum_s[-1] + get_space_width(font))
+        INF = float("inf")
+        best = [0.0] + [INF] * n
+        prev = [0] * (n + 1)
+        for j in range(1, n + 1):
+            for i in range(j - 1, -1, -1):
+                line_w = (cum_w[j] - cum_w[i]) + (cum_s[j - 1] - cum_s[i])
+                if line_w > target:
+                    if i < j - 1:
+                        break  # adding more words only overflows further
+                    cost = best[i] + 1e18  # forced over-wide single word
+                elif j == n:
+                    cost = best[i]
+                else:
+                    cost = best[i] + (target - line_w) ** 2
+                if cost < best[j]:
+                    best[j] = cost
+                    prev[j] = i
+        breaks = []
+        j = n
+        while j > 0:
+            breaks.append(j)
+            j = prev[j]
+        breaks.reverse()
+        start = 0
+        for end in breaks:
+            # Reuse the current line only if it is still empty (paragraph
+            # start); otherwise open a fresh one for each DP line
+            if not self.children or self.children[-1].children:
+                self.new_line()
+            self.cursor_x = 0
+            for node, word, font, w in items[start:end]:
+                self._append_text(node, word, font, w)
+                self.cursor_x += w + get_space_width(font)
+            start = end
 
     # Chapter 8: Handle input/button elements
     def input(self, node: Element) -> None:
+        # Inputs break the staged paragraph; they are placed greedily even
+        # in optimal-fit mode so focus/click geometry stays predictable
+        if self._pending:
+            self._flush_pending()
         w = INPUT_WIDTH_PX
         if self.cursor_x + w > self.width:
             self.new_line()
-        line = self.children[-1]
-        previous_word = line.children[-1] if line.children else None
-        input_layout = InputLayout(node, line, previous_word)
-        line.children.append(input_layout)
-
         weight = parse_font_weight(node.style.get("font-weight", "normal"))
         style_val = parse_font_style(node.style.get("font-style", "normal"))
         size = parse_font_size(node.style.get("font-size", "16px"))
@@ -1035,7 +1389,26 @@ class BlockLayout:
         if family.startswith("var"):
             family = "Times"
         font = get_font(size, weight, style_val, family)
-        self.cursor_x += w + font.measure(" ")
+
+        line = self.children[-1]
+        previous_word = line.children[-1] if line.children else None
+        input_layout = InputLayout(node, line, previous_word, font=font)
+        a, d, _ = font_metrics(font)
+        input_layout.ascent = a
+        if a > line.max_ascent:
+            line.max_ascent = a
+        if d > line.max_descent:
+            line.max_descent = d
+        line.children.append(input_layout)
+        self.cursor_x += w + get_space_width(font)
+
+    # Tag -> handler table, same shape as HTMLParser.TAG_ACTIONS: one dict
+    # lookup per element instead of a chain of string comparisons
+    TAG_HANDLERS = {
+        "br": _br,
+        "input": input,
+        "button": input,
+    }
 
     def self_rect(self) -> Rect:
         return Rect(self.x, self.y, self.x + self.width, self.y + self.height)
@@ -1078,6 +1451,11 @@ class Tab:
         self.display_list: List = []
         self.rules: List = []
         self.focus: Optional[Element] = None  # Chapter 8: focused input element
+        # Culling index built in render(): commands sorted by top plus a
+        # running max of bottoms, so visible_commands can bisect
+        self._cull_cmds: List = []
+        self._cull_tops: List[float] = []
+        self._cull_maxbot: List[float] = []
 
     def load(self, url: URL, payload: Optional[str] = None) -> None:
         self.url = url
@@ -1085,7 +1463,7 @@ class Tab:
         self.scroll = 0
         body = self.browser.fetch_url(url, payload)
         body = self.browser.decode_entities(body)
-        self.nodes = HTMLParser(body).parse()
+        self.nodes = self.browser.parse_html(body)
 
         self.rules = CSSParser(DEFAULT_STYLE_SHEET_TEXT).parse()
         links = [node.attributes["href"]
@@ -1094,13 +1472,60 @@ class Tab:
                  and node.tag == "link"
                  and node.attributes.get("rel") == "stylesheet"
                  and "href" in node.attributes]
+        # Stylesheets are independent fetches, so overlap them: one worker
+        # per (scheme, host, port) group. Within a group requests stay
+        # serial, so each worker owns that host's keep-alive socket and the
+        # per-browser sockets/cache dicts are never touched concurrently
+        # for the same key. Workers don't follow redirects - a redirect can
+        # hop onto another worker's host and interleave on its socket - so
+        # 3xx responses come back as-is and are followed serially after the
+        # pool joins. Rules are still applied in document order.
+        groups: Dict[Tuple, List[URL]] = {}
+        resolved: List[URL] = []
         for link in links:
             try:
                 style_url = url.resolve(link)
-                style_body = self.browser.fetch_url(style_url)
-                self.rules.extend(CSSParser(style_body).parse())
-            except:
+            except Exception:
                 continue
+            resolved.append(style_url)
+            gkey = (style_url.scheme, getattr(style_url, "host", None),
+                    getattr(style_url, "port", None))
+            groups.setdefault(gkey, []).append(style_url)
+
+        def fetch_group(group: List[URL]) -> Dict[int, Response]:
+            responses = {}
+            for style_url in group:
+                try:
+                    responses[id(style_url)] = self.browser.fetch(
+                        style_url, redirects_left=0)
+                except Exception:
+                    continue
+            return responses
+
+        fetched: Dict[int, Response] = {}
+        if len(groups) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(groups))) as pool:
+                for responses in pool.map(fetch_group, groups.values()):
+                    fetched.update(responses)
+        elif groups:
+            # Single host: no threads needed, avoid executor setup cost
+            fetched = fetch_group(next(iter(groups.values())))
+
+        for style_url in resolved:
+            resp = fetched.get(id(style_url))
+            if resp is None:
+                continue
+            if 300 <= resp.status <= 399 and "location" in resp.headers:
+                # Serial redirect follow-up, back on the main thread
+                try:
+                    loc = self.browser.resolve_location(
+                        style_url, resp.headers["location"])
+                    style_body = self.browser.fetch_url(URL(loc))
+                except Exception:
+                    continue
+            else:
+                style_body = resp.body.decode("utf-8", errors="replace")
+            self.rules.extend(CSSParser(style_body).parse())
         self.render()
 
     # Chapter 8: Separate render from load
@@ -1110,14 +1535,29 @@ class Tab:
         self.document.layout()
         self.display_list = []
         paint_tree(self.document, self.display_list)
-
-    def draw(self, canvas: tkinter.Canvas, offset: float) -> None:
-        for cmd in self.display_list:
-            if cmd.rect.top > self.scroll + self.tab_height:
-                continue
-            if cmd.rect.bottom < self.scroll:
-                continue
-            cmd.execute(self.scroll - offset, canvas)
+        # Paint output is already nearly sorted by top, so the stable sort is
+        # ~O(N) and keeps paint order for ties (backgrounds before their text)
+        cmds = sorted(self.display_list, key=lambda c: c.rect.top)
+        self._cull_cmds = cmds
+        self._cull_tops = [c.rect.top for c in cmds]
+        maxbot = []
+        running = float("-inf")
+        for c in cmds:
+            b = c.rect.bottom
+            if b > running:
+                running = b
+            maxbot.append(running)
+        self._cull_maxbot = maxbot
+
+    def visible_commands(self) -> List:
+        # Two bisects bound the candidate range instead of filtering the whole
+        # display list per frame: everything before lo ends above the viewport
+        # (running-max bottom), everything after hi starts below it. Only the
+        # short in-range slice still needs the exact bottom check.
+        scroll = self.scroll
+        lo = bisect_left(self._cull_maxbot, scroll)
+        hi = bisect_right(self._cull_tops, scroll + self.tab_height)
+        return [c for c in self._cull_cmds[lo:hi] if c.rect.bottom >= scroll]
 
     def scrolldown(self) -> None:
         max_y = max(self.document.height + 2 * VSTEP - self.tab_height, 0)
@@ -1206,7 +1646,7 @@ class Chrome:
         self.address_bar: str = ""
 
         self.font = get_font(20, "normal", "roman")
-        self.font_height = self.font.metrics("linespace")
+        self.font_height = font_metrics(self.font)[2]
 
         self.padding = 5
         self.tabbar_top = 0
@@ -1349,6 +1789,9 @@ class Browser:
     def __init__(self):
         self.sockets: Dict[Tuple[str, str, int], socket.socket] = {}
         self.cache: Dict[str, Tuple[float, Response]] = {}
+        # Parsed DOM per body hash (LRU): back/forward and cached responses
+        # skip the Python-heavy HTML parse entirely
+        self.tree_cache: "OrderedDict[bytes, Element]" = OrderedDict()
 
         self.window = tkinter.Tk()
         self.canvas = tkinter.Canvas(self.window, width=WIDTH, height=HEIGHT, bg="white")
@@ -1358,6 +1801,8 @@ class Browser:
         self.active_tab: Optional[Tab] = None
         self.chrome = Chrome(self)
         self.focus: Optional[str] = None  # Chapter 8: "content" or None
+        # (command type, canvas item id) per drawn command, for reuse in draw
+        self._canvas_items: List[Tuple[type, int]] = []
 
         self.window.bind("<Down>", self.handle_down)
         self.window.bind("<Up>", self.handle_up)
@@ -1366,6 +1811,36 @@ class Browser:
         self.window.bind("<Return>", self.handle_enter)
         self.window.bind("<BackSpace>", self.handle_backspace)
         self.window.bind("<MouseWheel>", self.handle_mousewheel)
+        self.window.bind("<Configure>", self.handle_configure)
+        # Resize coalescing state: Tk streams Configure events during an
+        # interactive drag; relayout runs at most once per ~frame
+        self._laidout_size: Tuple[int, int] = (WIDTH, HEIGHT)
+        self._pending_size: Optional[Tuple[int, int]] = None
+        self._resize_job: Optional[str] = None
+
+    def handle_configure(self, e) -> None:
+        if e.widget is not self.window:
+            return
+        self._pending_size = (e.width, e.height)
+        if self._resize_job is None:
+            self._resize_job = self.window.after(16, self._apply_resize)
+
+    def _apply_resize(self) -> None:
+        self._resize_job = None
+        size = self._pending_size
+        self._pending_size = None
+        if size is None or size == self._laidout_size:
+            return  # moved, not resized - keep the current layout
+        global WIDTH, HEIGHT
+        WIDTH, HEIGHT = size
+        self._laidout_size = size
+        # Re-layout is cheap now that word widths and font metrics are
+        # cached; the cost here is the Python tree walk, bounded to ~60 Hz
+        for tab in self.tabs:
+            tab.tab_height = HEIGHT - self.chrome.bottom
+            if tab.nodes is not None:
+                tab.render()
+        self.draw()
 
     def new_tab(self, url: URL) -> None:
         new_tab = Tab(HEIGHT - self.chrome.bottom, self)
@@ -1423,10 +1898,99 @@ class Browser:
         self.draw()
 
     def draw(self) -> None:
-        self.canvas.delete("all")
-        self.active_tab.draw(self.canvas, self.chrome.bottom)
+        # Retained-mode redraw: instead of delete("all") plus recreating every
+        # item, reuse existing canvas items via coords/itemconfigure and only
+        # create/delete where the frame actually changed shape
+        tab = self.active_tab
+        frame: List[Tuple] = []
+        tab_scroll = tab.scroll - self.chrome.bottom
+        for cmd in tab.visible_commands():
+            frame.append((cmd, tab_scroll))
         for cmd in self.chrome.paint():
-            cmd.execute(0, self.canvas)
+            frame.append((cmd, 0))
+
+        items = self._canvas_items
+        # items can only be reused while the command types line up, since
+        # canvas stacking order follows creation order
+        keep = 0
+        limit = min(len(items), len(frame))
+        while keep < limit and items[keep][0] is type(frame[keep][0]):
+            keep += 1
+        for _, item in items[keep:]:
+            self.canvas.delete(item)
+        del items[keep:]
+        for (cls, item), (cmd, scroll) in zip(items, frame):
+            cmd.update(self.canvas, item, scroll)
+        # Create the remainder; runs of DrawText go through one generated Tcl
+        # script instead of one Python->Tcl dispatch per word
+        new_cmds = frame[keep:]
+        i = 0
+        while i < len(new_cmds):
+            cmd, scroll = new_cmds[i]
+            if isinstance(cmd, DrawText):
+                j = i
+                while j < len(new_cmds) and isinstance(new_cmds[j][0], DrawText):
+                    j += 1
+                batch = new_cmds[i:j]
+                try:
+                    ids = self._bulk_create_text(batch)
+                except tkinter.TclError:
+                    # e.g. an invalid fill color: the script aborts mid-batch,
+                    # so delete the items it already created (__ids in the
+                    # interp survives the failed eval) before falling back to
+                    # the per-item path, which degrades colors individually
+                    try:
+                        partial = self.canvas.tk.eval("set __ids")
+                    except tkinter.TclError:
+                        partial = ""
+                    if partial:
+                        self.canvas.delete(*partial.split())
+                    ids = [c.create(self.canvas, s) for c, s in batch]
+                items.extend((DrawText, item) for item in ids)
+                i = j
+            else:
+                items.append((type(cmd), cmd.create(self.canvas, scroll)))
+                i += 1
+
+    def _bulk_create_text(self, batch: List[Tuple[DrawText, float]]) -> List[int]:
+        cv = str(self.canvas)
+        lines = ["set __ids {}"]
+        for cmd, scroll in batch:
+            color = cmd.color if cmd.color and not cmd.color.startswith("var") else "black"
+            lines.append(
+                f"lappend __ids [{cv} create text"
+                f" {cmd.rect.left} {cmd.rect.top - scroll}"
+                f" -text {tcl_quote(cmd.text)} -font {tcl_quote(str(cmd.font))}"
+                f" -anchor nw -fill {tcl_quote(color)}]"
+            )
+        lines.append("set __ids")
+        result = self.canvas.tk.eval("\n".join(lines))
+        return [int(item) for item in result.split()]
+
+    _TREE_CACHE_MAX = 16
+
+    def parse_html(self, body: str) -> Element:
+        """Parse HTML, reusing the cached tree when the body is identical.
+
+        Keyed by content hash (same shape as cli's render cache), so a
+        revisit through the response cache or history costs one hash pass
+        instead of a full parse. The tree is shared across visits: focus
+        flags are cleared on reuse, while typed input values persist like
+        real back-navigation form state.
+        """
+        key = hashlib.blake2b(body.encode("utf-8", "replace"),
+                              digest_size=16).digest()
+        tree = self.tree_cache.get(key)
+        if tree is not None:
+            self.tree_cache.move_to_end(key)
+            for node in tree_to_list(tree, []):
+                node.is_focused = False
+            return tree
+        tree = HTMLParser(body).parse()
+        self.tree_cache[key] = tree
+        if len(self.tree_cache) > self._TREE_CACHE_MAX:
+            self.tree_cache.popitem(last=False)
+        return tree
 
     # ---- Networking methods ----
     # Chapter 8: Added payload parameter for POST
@@ -1488,8 +2052,7 @@ class Browser:
             s = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
             s.connect((url.host, url.port))
             if url.scheme == "https":
-                ctx = ssl.create_default_context()
-                s = ctx.wrap_socket(s, server_hostname=url.host)
+                s = _SSL_CTX.wrap_socket(s, server_hostname=url.host)
             self.sockets[key] = s
 
         # Chapter 8: POST vs GET
@@ -1504,19 +2067,26 @@ class Browser:
             headers["Content-Length"] = str(len(payload.encode("utf-8")))
             headers["Content-Type"] = "application/x-www-form-urlencoded"
 
-        req = f"{method} {url.path} HTTP/1.1\r\n"
-        req += "".join(f"{k}: {v}\r\n" for k, v in headers.items())
-        req += "\r\n"
-        if payload:
-            req += payload
-        s.send(req.encode("utf-8"))
+        # Build the request in one join and use sendall: send() may write
+        # short on TLS sockets and silently truncate the request
+        req = "".join((
+            f"{method} {url.path} HTTP/1.1\r\n",
+            "".join(f"{k}: {v}\r\n" for k, v in headers.items()),
+            "\r\n",
+            payload or "",
+        )).encode("utf-8")
+        s.sendall(req)
 
         f = s.makefile("rb")
-        statusline = f.readline().decode("iso-8859-1", errors="replace").rstrip("\r\n")
-        if not statusline:
+        # Read status line + headers as one block and decode once, instead
+        # of a readline + decode per header line
+        block = self.read_header_block(f)
+        if not block:
             self.close_socket(key)
             return self.request_http(url, payload)
+        lines = block.decode("iso-8859-1", errors="replace").split("\r\n")
 
+        statusline = lines[0]
         parts = statusline.split(" ", 2)
         if len(parts) < 2:
             self.close_socket(key)
@@ -1529,20 +2099,22 @@ class Browser:
         reason = parts[2] if len(parts) >= 3 else ""
 
         resp_headers: Dict[str, str] = {}
-        while True:
-            line = f.readline()
-            if line in (b"\r\n", b"\n", b""):
-                break
-            decoded = line.decode("iso-8859-1", errors="replace").rstrip("\r\n")
-            if ":" not in decoded:
+        for line in lines[1:]:
+            if not line or ":" not in line:
                 continue
-            k, v = decoded.split(":", 1)
+            k, v = line.split(":", 1)
             resp_headers[k.casefold()] = v.strip()
 
-        body = self.read_body_bytes(f, resp_headers)
-
+        # Build the decoder right after the headers so the body decompresses
+        # as it streams in: receive and inflate overlap, and we never hold
+        # the compressed and decompressed copies at the same time
+        decoder = None
         if resp_headers.get("content-encoding", "").lower() == "gzip":
-            body = gzip.decompress(body)
+            decoder = zlib.decompressobj(wbits=31)
+
+        body = self.read_body_bytes(f, resp_headers, decoder)
+
+        if decoder is not None:
             resp_headers.pop("content-encoding", None)
 
         if resp_headers.get("connection", "").lower() == "close":
@@ -1550,9 +2122,66 @@ class Browser:
 
         return Response(url=url, status=status_i, reason=reason, headers=resp_headers, body=body)
 
-    def read_body_bytes(self, f, headers: Dict[str, str]) -> bytes:
+    def read_header_block(self, f) -> bytes:
+        # Pull whatever is already buffered with peek and consume bytes
+        # exactly up to the CRLFCRLF terminator, so no body bytes are eaten
+        # (peeked bytes are guaranteed buffered, so read() never blocks)
+        buf = bytearray()
+        while True:
+            peeked = f.peek(4096)
+            if not peeked:
+                b = f.read(1)
+                if not b:
+                    # EOF: return what we have (may be empty)
+                    return bytes(buf)
+                buf += b
+                if buf.endswith(b"\r\n\r\n"):
+                    return bytes(buf)
+                continue
+            # The terminator can straddle the peek boundary, so search the
+            # last 3 already-consumed bytes together with the peeked data
+            tail_len = min(3, len(buf))
+            idx = (bytes(buf[-3:]) + peeked).find(b"\r\n\r\n") if tail_len \
+                else peeked.find(b"\r\n\r\n")
+            if idx >= 0:
+                buf += f.read(idx + 4 - tail_len)
+                return bytes(buf)
+            buf += f.read(len(peeked))
+
+    def read_body_bytes(self, f, headers: Dict[str, str], decoder=None) -> bytes:
+        # Raw bodies are read with readinto straight into one bytearray (a
+        # known Content-Length is a single allocation, no chunk list + join);
+        # compressed bodies stream 64KB slices of a reused scratch buffer
+        # through the decoder so nothing is copied before decompression
+        parts: List[bytes] = []
+        scratch = bytearray(65536) if decoder is not None else None
+
+        def feed_exact(total: int) -> int:
+            """Read up to total bytes through the decoder; return bytes read"""
+            done = 0
+            with memoryview(scratch) as mv:
+                while done < total:
+                    n = f.readinto(mv[:min(65536, total - done)])
+                    if not n:
+                        break
+                    done += n
+                    chunk = decoder.decompress(mv[:n])
+                    if chunk:
+                        parts.append(chunk)
+            return done
+
+        def read_exact_into(buf: bytearray, start: int, total: int) -> int:
+            done = 0
+            with memoryview(buf) as mv:
+                while done < total:
+                    n = f.readinto(mv[start + done:start + total])
+                    if not n:
+                        break
+                    done += n
+            return done
+
         if headers.get("transfer-encoding", "").lower() == "chunked":
-            chunks = []
+            buf = bytearray()
             while True:
                 line = f.readline().strip()
                 size = int(line.split(b";", 1)[0], 16)
@@ -1562,14 +2191,50 @@ class Browser:
                         if trailer in (b"\r\n", b"\n", b""):
                             break
                     break
-                chunks.append(f.read(size))
+                if decoder is not None:
+                    if feed_exact(size) < size:
+                        break
+                else:
+                    start = len(buf)
+                    buf += bytes(size)
+                    got = read_exact_into(buf, start, size)
+                    if got < size:
+                        del buf[start + got:]
+                        break
                 f.read(2)
-            return b"".join(chunks)
-
-        if "content-length" in headers:
-            return f.read(int(headers["content-length"]))
+            if decoder is None:
+                return bytes(buf)
+        elif "content-length" in headers:
+            length = int(headers["content-length"])
+            if decoder is None:
+                buf = bytearray(length)
+                got = read_exact_into(buf, 0, length)
+                if got < length:
+                    del buf[got:]
+                return bytes(buf)
+            feed_exact(length)
+        else:
+            if decoder is None:
+                buf = bytearray()
+                while True:
+                    piece = f.read(65536)
+                    if not piece:
+                        break
+                    buf += piece
+                return bytes(buf)
+            while True:
+                with memoryview(scratch) as mv:
+                    n = f.readinto(mv)
+                if not n:
+                    break
+                chunk = decoder.decompress(memoryview(scratch)[:n])
+                if chunk:
+                    parts.append(chunk)
 
-        return f.read()
+        tail = decoder.flush()
+        if tail:
+            parts.append(tail)
+        return b"".join(parts)
 
     def resolve_location(self, base: URL, loc: str) -> str:
         if "://" in loc or loc.startswith(("data:", "file:", "view-source:", "about:")):
@@ -1596,12 +2261,11 @@ class Browser:
         return None
 
     def decode_entities(self, text: str) -> str:
-        return (
-            text.replace("&lt;", "<")
-                .replace("&gt;", ">")
-                .replace("&amp;", "&")
-                .replace("&shy;", SOFT_HYPHEN)
-        )
+        # Chained replaces scanned the string four times and double-decoded
+        # sequences like "&amp;lt;"; a single regex pass does neither.
+        if "&" not in text:
+            return text
+        return _ENTITY_RE.sub(lambda m: _ENTITIES[m.group(1)], text)
 
     def close_socket(self, key: Tuple[str, str, int]) -> None:
         s = self.sockets.pop(key, None)
@@ -1,165 +1,893 @@
+import re
 import socket
 import ssl
 import gzip
 import zlib
-import brotli
+try:
+    # brotlicffi가 설치돼 있으면 우선 사용 (C 라이브러리 바인딩 보장 -
+    # 순수 파이썬 폴백으로 br 해제가 CPU 병목이 되는 것을 방지)
+    import brotlicffi as brotli
+except ImportError:
+    import brotli
+try:
+    # 인텔 ISA-L 바인딩이 있으면 gzip/deflate 해제가 약 2배 빨라짐
+    # (zlib과 같은 decompressobj 스트리밍 API라 그대로 바꿔 끼울 수 있음)
+    from isal import isal_zlib as _zlib_impl
+except ImportError:
+    _zlib_impl = zlib
+try:
+    # zstd는 선택 의존성 - 설치돼 있을 때만 Accept-Encoding에 광고
+    # (CDN이 zstd를 협상하면 brotli 대비 해제가 수 배 빠름)
+    import zstandard
+except ImportError:
+    zstandard = None
 import os
 import base64
 import time
 from urllib.parse import urlparse, unquote, unquote_to_bytes, urljoin
+from collections import OrderedDict
+import logging
+from email.utils import parsedate_to_datetime
 from pathlib import Path
+import mmap
 import atexit
 
+# 요청 핫패스의 진행 메시지용 로거 - 기본 레벨(WARNING)에서는 아무것도
+# 출력하지 않음. 디버깅 시 logging.basicConfig(level=logging.DEBUG)로 켬.
+_log = logging.getLogger("browser.url")
+
+
+class _DeflateDecoder:
+    """deflate 스트리밍 디코더 (zlib 헤더 유무 둘 다 처리)
+
+    첫 조각이 zlib 형식으로 안 풀리면 raw deflate로 전환한다.
+    """
+
+    def __init__(self):
+        self._first_try = True
+        self._data = b""
+        self._obj = _zlib_impl.decompressobj()
+
+    def decompress(self, data):
+        if not data:
+            return b""
+        if not self._first_try:
+            return self._obj.decompress(data)
+        self._data += data
+        try:
+            out = self._obj.decompress(data)
+            if out:
+                self._first_try = False
+                self._data = b""
+            return out
+        except _zlib_impl.error:
+            # zlib 헤더가 없는 raw deflate - 지금까지 모은 데이터로 재시작
+            self._first_try = False
+            self._obj = _zlib_impl.decompressobj(-_zlib_impl.MAX_WBITS)
+            data = self._data
+            self._data = b""
+            return self._obj.decompress(data)
+
+    def flush(self):
+        return self._obj.flush()
+
+
+class _BrotliDecoder:
+    """brotli.Decompressor를 zlib 디코더와 같은 모양으로 감싼 어댑터"""
+
+    def __init__(self):
+        self._obj = brotli.Decompressor()
+        # brotli는 process(), brotlicffi는 decompress()라는 이름을 씀
+        self._feed = getattr(self._obj, "process", None) or self._obj.decompress
+
+    def decompress(self, data):
+        return self._feed(data)
+
 
 class URL:
     """URL을 파싱하고 관리하는 클래스"""
     
-    # 클래스 변수: 소켓 캐시 (host:port를 키로 사용)
-    _socket_cache = {}
+    # 클래스 변수: 연결 풀 {(scheme, host, port): [(socket, 마지막 사용 시각), ...]}
+    # 호스트당 소켓 하나가 아니라 LIFO 풀로 관리 (요청 중인 소켓은 풀에서 빠짐)
+    _socket_pool = {}
+
+    # 풀 설정: 유휴 연결 만료 시간과 호스트당 최대 보관 개수
+    _POOL_IDLE_TIMEOUT = 30.0
+    _POOL_MAX_PER_HOST = 20
+
+    # DNS 결과 캐시 {(host, port): (getaddrinfo 결과, 만료 시각)}
+    # connect()는 내부에서 매번 getaddrinfo를 다시 부르므로 직접 캐시함
+    _dns_cache = {}
+    _DNS_TTL = 60.0
+
+    # 공유 TLS 컨텍스트 - create_default_context()는 호출마다 CA 번들을
+    # 디스크에서 다시 읽으므로 한 번만 만들어 모든 연결이 공유
+    _ssl_context = None
     
     # 클래스 변수: 콘텐츠 캐시 {url: {body, headers, timestamp, max_age}}
-    _content_cache = {}
-    
-    # 캐시 가능한 파일 확장자
+    # OrderedDict LRU - 엔트리 수와 본문 총 바이트 양쪽에 상한을 둠
+    _content_cache = OrderedDict()
+    _content_cache_bytes = 0
+    _CONTENT_CACHE_MAX = 256
+    _CONTENT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+    # 로컬 파일 캐시 {(경로, st_mtime_ns, st_size): bytes} - LRU, 최대 64개
+    # 파일이 바뀌면 키 자체가 달라지므로 별도 무효화 로직 불필요
+    _file_cache = OrderedDict()
+    _FILE_CACHE_MAX = 64
+    # 이 크기를 넘는 파일은 캐시 대신 mmap으로 읽음
+    _FILE_MMAP_THRESHOLD = 1 << 20
+
+
+    # 캐시 가능한 파일 확장자 (점 없이 저장 - rpartition으로 빠르게 비교)
     _CACHEABLE_EXTENSIONS = {
-        '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico',  # 이미지
-        '.css',  # 스타일
-        '.js', '.mjs',  # 스크립트
-        '.woff', '.woff2', '.ttf', '.eot',  # 폰트
+        'jpg', 'jpeg', 'png', 'gif', 'webp', 'svg', 'ico',  # 이미지
+        'css',  # 스타일
+        'js', 'mjs',  # 스크립트
+        'woff', 'woff2', 'ttf', 'eot',  # 폰트
     }
     
+    @staticmethod
+    def _acquire(pool_key):
+        """풀에서 살아있는 유휴 소켓 꺼내기 (가장 최근 것부터, LIFO)"""
+        pool = URL._socket_pool.get(pool_key)
+        if not pool:
+            return None
+        now = time.time()
+        while pool:
+            s, last_used = pool.pop()
+            # 유휴 시간 초과 → 폐기
+            if now - last_used > URL._POOL_IDLE_TIMEOUT:
+                try:
+                    s.close()
+                except Exception:
+                    pass
+                continue
+            # 비차단 recv로 소켓 생존 확인
+            try:
+                s.setblocking(False)
+                if isinstance(s, ssl.SSLSocket):
+                    # SSLSocket은 recv 플래그를 거부함 (MSG_PEEK 불가).
+                    # 건강한 유휴 연결은 SSLWantReadError를 내고, 읽을 게
+                    # 있는 소켓은 어차피 폐기하므로 한 바이트 소비해도 무해
+                    data = s.recv(1)
+                else:
+                    data = s.recv(1, socket.MSG_PEEK)
+                # b""이면 서버가 닫은 것, 데이터가 남아있으면 상태가 꼬인 것
+                # 둘 다 재사용 불가
+                try:
+                    s.close()
+                except Exception:
+                    pass
+                continue
+            except (BlockingIOError, ssl.SSLWantReadError):
+                # 읽을 데이터 없음 = 정상적인 유휴 keep-alive 연결
+                s.setblocking(True)
+                s.settimeout(10.0)
+                return s
+            except Exception:
+                try:
+                    s.close()
+                except Exception:
+                    pass
+                continue
+        return None
+
+    @staticmethod
+    def _release(pool_key, s):
+        """요청이 끝난 keep-alive 소켓을 풀에 반납"""
+        pool = URL._socket_pool.setdefault(pool_key, [])
+        if len(pool) >= URL._POOL_MAX_PER_HOST:
+            try:
+                s.close()
+            except Exception:
+                pass
+            return
+        pool.append((s, time.time()))
+
+    @staticmethod
+    def _resolve(host, port):
+        """호스트의 주소를 캐시와 함께 조회 (IPv6 주소를 앞에 배치)"""
+        key = (host, port)
+        now = time.time()
+        hit = URL._dns_cache.get(key)
+        if hit and now < hit[1]:
+            return hit[0]
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        # IPv6 우선 - 현대 TCP 클라이언트의 기본 선호 순서
+        infos.sort(key=lambda ai: 0 if ai[0] == socket.AF_INET6 else 1)
+        URL._dns_cache[key] = (infos, now + URL._DNS_TTL)
+        return infos
+
+    @staticmethod
+    def _get_ssl_context():
+        """프로세스 전체가 공유하는 TLS 컨텍스트 (최초 1회만 생성)"""
+        if URL._ssl_context is None:
+            URL._ssl_context = ssl.create_default_context()
+        return URL._ssl_context
+
+    @staticmethod
+    def _connect(host, port, timeout=10.0):
+        """캐시된 DNS 결과로 TCP 연결 (IPv6 먼저, 실패하면 다음 주소로)"""
+        last_err = None
+        for family, type_, proto, _, sockaddr in URL._resolve(host, port):
+            s = socket.socket(family, type_, proto)
+            s.settimeout(timeout)
+            try:
+                s.connect(sockaddr)
+                return s
+            except OSError as e:
+                last_err = e
+                try:
+                    s.close()
+                except Exception:
+                    pass
+        raise Exception(f"Network error connecting to {host}:{port} - {last_err}")
+
     @staticmethod
     def _is_cacheable(url_path):
-        """캐시 가능한 리소스인지 확인"""
-        ext = os.path.splitext(url_path.lower())[1]
-        return ext in URL._CACHEABLE_EXTENSIONS
+        """캐시 가능한 리소스인지 확인 (splitext 없이 확장자만 뽑아 비교)"""
+        ext = url_path.rpartition('.')[2]
+        # 점이 없으면 경로 전체가 나오지만 '/'가 섞여 있어 매치되지 않음
+        return ext.lower() in URL._CACHEABLE_EXTENSIONS
     
     @staticmethod
     def _parse_cache_control(cache_control_header):
         """
         Cache-Control 헤더 파싱
-        리턴: (no_store: bool, max_age: int or None)
+        리턴: (no_store: bool, no_cache: bool, max_age: int or None)
         """
         if not cache_control_header:
-            return False, None
+            return False, False, None
         
         directives = [d.strip().lower() for d in cache_control_header.split(',')]
         no_store = False
+        no_cache = False
         max_age = None
         
         for directive in directives:
             if directive == 'no-store':
                 no_store = True
+            elif directive == 'no-cache':
+                # 저장은 가능하지만 쓸 때마다 재검증 필요
+                no_cache = True
             elif directive.startswith('max-age='):
                 try:
                     max_age = int(directive.split('=')[1])
                 except (ValueError, IndexError):
                     pass
         
-        return no_store, max_age
+        return no_store, no_cache, max_age
     
     @staticmethod
-    def _get_from_cache(full_url):
-        """캐시에서 데이터 가져오기 (만료 확인)"""
-        if full_url not in URL._content_cache:
-            return None
-        
-        cache_entry = URL._content_cache[full_url]
-        timestamp = cache_entry['timestamp']
-        max_age = cache_entry['max_age']
-        
-        # max_age가 없으면 영구 캐시
-        if max_age is None:
-            return cache_entry
-        
-        # max_age 확인
-        elapsed = time.time() - timestamp
-        if elapsed < max_age:
-            return cache_entry
-        else:
-            # 만료됨 - 캐시에서 제거
-            print(f"⏰ 캐시 만료: {full_url}")
-            del URL._content_cache[full_url]
+    def _is_fresh(entry):
+        """캐시 엔트리가 아직 신선한지 확인 (max-age → Expires 순서)"""
+        if entry.get('no_cache'):
+            # no-cache: 쓸 때마다 재검증
+            return False
+        max_age = entry['max_age']
+        if max_age is not None:
+            return time.time() - entry['timestamp'] < max_age
+        expires = entry.get('expires')
+        if expires is not None:
+            return time.time() < expires
+        # 신선도 정보가 전혀 없으면 기존 동작대로 영구 캐시
+        return True
+
+    @staticmethod
+    def _lookup_cache(full_url):
+        """캐시 조회: (엔트리, 신선 여부) 또는 None.
+
+        낡은 엔트리도 지우지 않고 돌려줌 - ETag/Last-Modified로
+        조건부 재검증(304)에 쓸 수 있기 때문.
+        """
+        entry = URL._content_cache.get(full_url)
+        if entry is None:
             return None
+        # LRU 갱신: 최근에 쓴 엔트리를 끝으로 이동
+        URL._content_cache.move_to_end(full_url)
+        fresh = URL._is_fresh(entry)
+        if not fresh:
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug(f"⏰ 캐시 만료 (재검증 대상): {full_url}")
+        return entry, fresh
+
+    @staticmethod
+    def _get_from_cache(full_url):
+        """신선한 캐시 엔트리만 가져오기 (파이프라인 경로용)"""
+        hit = URL._lookup_cache(full_url)
+        if hit and hit[1]:
+            return hit[0]
+        return None
     
     @staticmethod
-    def _save_to_cache(full_url, body, headers, max_age):
-        """캐시에 데이터 저장"""
+    def _save_to_cache(full_url, body, headers, max_age, no_cache=False):
+        """캐시에 데이터 저장 (재검증용 ETag/Last-Modified/Expires 포함)"""
+        expires = None
+        if max_age is None:
+            # max-age가 없으면 Expires 헤더를 신선도 기준으로 사용
+            expires_header = headers.get('expires')
+            if expires_header:
+                try:
+                    expires = parsedate_to_datetime(expires_header).timestamp()
+                except (TypeError, ValueError):
+                    pass
+        old = URL._content_cache.get(full_url)
+        if old is not None:
+            URL._content_cache_bytes -= len(old['body'])
         URL._content_cache[full_url] = {
-            'body': body,
+            'body': body,   # bytes - 디코딩은 소비자 몫
+            'charset': URL._charset_from_headers(headers),
             'headers': headers,
             'timestamp': time.time(),
-            'max_age': max_age
+            'max_age': max_age,
+            'expires': expires,
+            'no_cache': no_cache,
+            'etag': headers.get('etag'),
+            'last_modified': headers.get('last-modified'),
         }
-        print(f"💾 캐시 저장: {full_url} (max-age: {max_age if max_age else 'unlimited'})")
+        URL._content_cache.move_to_end(full_url)
+        URL._content_cache_bytes += len(body)
+        # 엔트리 수/총 바이트 상한 초과 시 가장 오래 안 쓴 것부터 제거
+        while (len(URL._content_cache) > URL._CONTENT_CACHE_MAX or
+               URL._content_cache_bytes > URL._CONTENT_CACHE_MAX_BYTES):
+            _, evicted = URL._content_cache.popitem(last=False)
+            URL._content_cache_bytes -= len(evicted['body'])
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug(f"💾 캐시 저장: {full_url} (max-age: {max_age if max_age else 'unlimited'})")
     
+    # data URI 메타 파싱: (mediatype)(;옵션들),(데이터)
+    _DATA_META_RE = re.compile(r'([^,;]*)((?:;[^,;]*)*),(.*)', re.S)
+
     def __init__(self, url):
-        # 더 안정적인 파싱을 위해 urllib.parse 사용
+        # http(s) 핫패스: urlparse는 모든 엣지 케이스를 다루느라 느리므로
+        # 흔한 http://host[:port]/path 형태는 문자열 연산으로 직접 파싱
+        if url.startswith("http://"):
+            self.scheme = "http"
+            self._init_http_fast(url[7:], 80)
+            return
+        if url.startswith("https://"):
+            self.scheme = "https"
+            self._init_http_fast(url[8:], 443)
+            return
+
+        # 느린 경로: 나머지 스킴은 urlparse + 핸들러 테이블
         parsed = urlparse(url)
         self.scheme = parsed.scheme
+        handler = URL._SCHEME_HANDLERS.get(self.scheme)
+        if handler is None:
+            raise AssertionError(f"Unknown scheme {self.scheme}")
+        handler(self, url, parsed)
 
-        if self.scheme in ["http", "https"]:
-            # host와 path 분리
-            self.host = parsed.netloc
-            self.path = parsed.path or "/"
-            # 포트번호 설정 (http는 80, https는 443)
-            if self.scheme == "http":
-                self.port = 80
-            elif self.scheme == "https":
-                self.port = 443
-        elif self.scheme == "file":
-            # file URL: file:///C:/path or file:///home/user/file
-            # parsed.netloc는 보통 빈 문자열 또는 'localhost'
-            # unquote하지 않으면 os가 실제 경로를 찾지를 못함
-            raw_path = unquote(parsed.path)
-            # Windows 드라이브 표기 처리: '/C:/path' -> 'C:/path'
-            if os.name == 'nt' and raw_path.startswith("/") and len(raw_path) > 2 and raw_path[2] == ':' :
-                raw_path = raw_path.lstrip('/')
-            # 로컬 파일 경로 저장
-            self.filepath = raw_path
-        elif self.scheme == "data":
-            # data:[<mediatype>][;base64],<data>
-            # parsed.path may contain the whole data part; use the original URL
-            data_part = url.split(":", 1)[1]
+    def _init_http_fast(self, rest, default_port):
+        # 프래그먼트(#...)는 서버로 보내지 않음
+        frag = rest.find("#")
+        if frag != -1:
+            rest = rest[:frag]
+        slash = rest.find("/")
+        if slash == -1:
+            netloc, path = rest, "/"
+        else:
+            netloc, path = rest[:slash], rest[slash:]
+        # 명시적 포트 지원: host:port
+        port = default_port
+        colon = netloc.rfind(":")
+        if colon != -1:
             try:
-                meta, data = data_part.split(",", 1)
+                port = int(netloc[colon + 1:])
+                netloc = netloc[:colon]
             except ValueError:
-                raise ValueError("Invalid data URI: missing comma separator")
-            meta_parts = meta.split(";") if meta else []
-            mediatype = meta_parts[0] if meta_parts and meta_parts[0] else "text/plain"
-            is_base64 = "base64" in meta_parts
-            # extract charset if present
-            charset = None
-            for part in meta_parts:
-                if part.startswith("charset="):
-                    charset = part.split("=", 1)[1]
+                pass
+        self._set_http_fields(netloc, port, path)
+
+    def _init_http(self, url, parsed):
+        # urlparse 폴백 경로 (핫패스와 같은 필드 구성)
+        host = parsed.hostname or parsed.netloc
+        port = parsed.port or (80 if self.scheme == "http" else 443)
+        path = parsed.path or "/"
+        if parsed.query:
+            path += "?" + parsed.query
+        self._set_http_fields(host, port, path)
+
+    def _set_http_fields(self, host, port, path):
+        self.host = host
+        self.port = port
+        self.path = path
+        # 요청 핫패스에서 매번 계산하지 않도록 미리 계산
+        # (기본 포트가 아니면 캐시 키/리다이렉트 기준 URL에 포트 포함)
+        default_port = 80 if self.scheme == "http" else 443
+        netloc = host if port == default_port else f"{host}:{port}"
+        self._full_url = f"{self.scheme}://{netloc}{path}"
+        self._is_cacheable_flag = URL._is_cacheable(path)
+        self._host_b = host.encode("utf8")
+        self._path_b = path.encode("utf8")
+
+    @staticmethod
+    def _read_file(filepath):
+        """로컬 파일 읽기 - (경로, mtime, 크기) 키의 LRU 캐시 경유.
+
+        같은 파일을 다시 열 때(대화형 모드 재로드 등) 디스크 I/O를 건너뛰고,
+        파일이 수정되면 stat 키가 바뀌어 자동으로 새로 읽음.
+        """
+        # 존재 확인과 캐시 키 획득을 stat 한 번으로
+        try:
+            st = os.stat(filepath)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {filepath}")
+        # 큰 파일(>1MB)은 mmap으로 매핑해서 그대로 리턴 - read()의
+        # 중간 복사본 없이 커널 페이지 캐시를 바로 사용하고, LRU 캐시도
+        # 수 MB짜리 본문으로 채우지 않음 (mmap은 bytes처럼 동작)
+        if st.st_size > URL._FILE_MMAP_THRESHOLD:
+            with open(filepath, 'rb') as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        key = (filepath, st.st_mtime_ns, st.st_size)
+        cache = URL._file_cache
+        data = cache.get(key)
+        if data is not None:
+            cache.move_to_end(key)
+            return data
+        with open(filepath, 'rb') as f:
+            data = f.read()
+            # 잘못된 utf8은 디코딩 시점에 U+FFFD로 대체됨
+        cache[key] = data
+        if len(cache) > URL._FILE_CACHE_MAX:
+            cache.popitem(last=False)
+        return data
+
+    def _init_file(self, url, parsed):
+        # file URL: file:///C:/path or file:///home/user/file
+        # parsed.netloc는 보통 빈 문자열 또는 'localhost'
+        # unquote하지 않으면 os가 실제 경로를 찾지를 못함
+        raw_path = unquote(parsed.path)
+        # Windows 드라이브 표기 처리: '/C:/path' -> 'C:/path'
+        if os.name == 'nt' and raw_path.startswith("/") and len(raw_path) > 2 and raw_path[2] == ':':
+            raw_path = raw_path.lstrip('/')
+        # 로컬 파일 경로 저장
+        self.filepath = raw_path
+
+    def _init_data(self, url, parsed):
+        # data:[<mediatype>][;base64],<data>
+        # parsed.path에 데이터 전체가 들어갈 수 있으므로 원본 URL 사용
+        data_part = url.split(":", 1)[1]
+        m = URL._DATA_META_RE.match(data_part)
+        if m is None:
+            raise ValueError("Invalid data URI: missing comma separator")
+        mediatype, options, data = m.group(1), m.group(2), m.group(3)
+        # 옵션들은 ';base64' ';charset=...' 형태 (앞의 빈 조각 제거)
+        opt_parts = options.split(";")[1:] if options else []
+        is_base64 = "base64" in opt_parts
+        # charset 옵션이 있으면 추출
+        charset = None
+        for part in opt_parts:
+            if part.startswith("charset="):
+                charset = part.split("=", 1)[1]
+                break
+        # decode data
+        if is_base64:
+            try:
+                data_bytes = base64.b64decode(data)
+            except Exception as e:
+                raise ValueError(f"Invalid base64 data in data URI: {e}")
+        else:
+            # percent-decoded bytes
+            data_bytes = unquote_to_bytes(data)
+        # store for request()
+        self.data_bytes = data_bytes
+        self.data_mediatype = mediatype if mediatype else "text/plain"
+        self.data_charset = charset
+
+    def _init_view_source(self, url, parsed):
+        # view-source:<inner-uri> -> store inner URL object to fetch its source
+        # extract the remainder after the first ':' (preserve // for http/https)
+        inner_uri = url[len('view-source:'):]
+        # allow whitespace tolerance
+        inner_uri = inner_uri.strip()
+        # create URL object for inner resource
+        self.inner = URL(inner_uri)
+
+    # 스킴 -> 초기화 핸들러 (클래스 본문에서 한 번만 구성)
+    _SCHEME_HANDLERS = {
+        "http": _init_http,
+        "https": _init_http,
+        "file": _init_file,
+        "data": _init_data,
+        "view-source": _init_view_source,
+    }
+
+    # 요청 템플릿 - 문자열 누적 + encode 대신 bytes 포맷 한 번으로 생성
+    # (Keep-Alive 연결 유지, 압축 지원 광고 포함)
+    # 해제가 빠른 순서로 광고: zstd > br(압축률) > gzip/deflate
+    _ACCEPT_ENCODING = (b"zstd, br, gzip, deflate" if zstandard is not None
+                        else b"br, gzip, deflate")
+    _REQ_TEMPLATE = (b"GET %b HTTP/1.1\r\n"
+                     b"Host: %b\r\n"
+                     b"Connection: keep-alive\r\n"
+                     b"User-Agent: Mozilla/5.0 (CustomBrowser)\r\n"
+                     b"Accept-Encoding: " + _ACCEPT_ENCODING + b"\r\n"
+                     b"%b\r\n")
+
+    def _build_request_bytes(self, extra_headers=None):
+        """GET 요청 메시지를 바이트로 생성 (request/파이프라인 공용)"""
+        # 조건부 요청 헤더 등 추가 헤더 (If-None-Match, If-Modified-Since)
+        if extra_headers:
+            extra = "".join(f"{name}: {value}\r\n"
+                            for name, value in extra_headers.items())
+            extra_b = extra.encode("utf8")
+        else:
+            extra_b = b""
+        return URL._REQ_TEMPLATE % (self._path_b, self._host_b, extra_b)
+
+    @staticmethod
+    def _make_decoder(encoding):
+        """Content-Encoding에 맞는 증분(스트리밍) 디코더 생성.
+
+        본문 전체를 모아 한꺼번에 푸는 대신 도착하는 조각을 바로 해제하면
+        최대 메모리가 절반이 되고 네트워크 수신과 압축 해제가 겹쳐진다.
+        """
+        if encoding == "gzip":
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug("🗜️  gzip 스트리밍 압축 해제")
+            return _zlib_impl.decompressobj(16 + _zlib_impl.MAX_WBITS)
+        if encoding == "deflate":
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug("🗜️  deflate 스트리밍 압축 해제")
+            return _DeflateDecoder()
+        if encoding == "br":
+            return _BrotliDecoder()
+        if encoding == "zstd" and zstandard is not None:
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug("🗜️  zstd 스트리밍 압축 해제")
+            # zlib과 같은 decompress()/flush() 스트리밍 인터페이스
+            return zstandard.ZstdDecompressor().decompressobj()
+        if encoding:
+            # 알 수 없는 인코딩
+            raise Exception(f"Unsupported content-encoding: {encoding}")
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug("📄 압축 없음")
+        return None
+
+    @staticmethod
+    def _finish_decoder(decoder, parts):
+        """디코더에 남은 데이터를 뽑아서 parts에 추가 (brotli는 flush 없음)"""
+        flush = getattr(decoder, "flush", None)
+        if flush is not None:
+            tail = flush()
+            if tail:
+                parts.append(tail)
+
+    @staticmethod
+    def _read_chunked(rfile, decoder=None):
+        """Transfer-Encoding: chunked 본문 읽기. (본문, 트레일러 헤더) 리턴
+
+        디코더가 없으면 청크마다 bytes를 만들어 리스트에 모았다가 join으로
+        다시 복사하는 대신, bytearray 하나를 늘려가며 readinto로 바로 채움
+        (작은 청크가 수천 개일 때 할당/복사가 절반으로 줄어듦).
+        """
+        buf = bytearray()   # 디코더 없음: 원본 바이트를 직접 누적
+        parts = []          # 디코더 있음: 압축 해제된 조각들
+        trailers = {}
+        crlf = bytearray(2)  # 청크 끝 CRLF 소비용 스크래치 버퍼
+        while True:
+            # 청크 크기 라인 읽기
+            line = rfile.readline().decode("ascii")
+            if not line:
+                raise Exception("Unexpected EOF while reading chunk size")
+            line = line.strip()
+            # 사이즈 파싱 (세미콜론 뒤의 익스텐션 무시)
+            size_str = line.split(';', 1)[0]
+            try:
+                size = int(size_str, 16)
+            except ValueError:
+                raise Exception(f"Invalid chunk size: {size_str}")
+            if size == 0:
+                # 트레일러 헤더(있다면) 읽기: 빈 줄 전까지 헤더 라인들
+                while True:
+                    trailer_line = rfile.readline().decode("utf8")
+                    if trailer_line in ("\r\n", "\n", ""):
+                        break
+                    if ":" in trailer_line:
+                        h, v = trailer_line.split(":", 1)
+                        trailers[h.casefold()] = v.strip()
+                break
+            if decoder is not None:
+                data = rfile.read(size)
+                if data:
+                    parts.append(decoder.decompress(data))
+            else:
+                # bytearray를 size만큼 미리 늘리고 그 자리에 바로 읽기
+                start = len(buf)
+                buf.extend(bytes(size))
+                n = 0
+                with memoryview(buf) as view:
+                    while n < size:
+                        read = rfile.readinto(view[start + n:start + size])
+                        if not read:
+                            break
+                        n += read
+                if n < size:
+                    del buf[start + n:]
+            # 청크 끝의 CRLF 소비 (스크래치 버퍼 재사용)
+            n = 0
+            while n < 2:
+                with memoryview(crlf) as cview:
+                    read = rfile.readinto(cview[n:])
+                if not read:
                     break
-            # decode data
-            if is_base64:
-                try:
-                    data_bytes = base64.b64decode(data)
-                except Exception as e:
-                    raise ValueError(f"Invalid base64 data in data URI: {e}")
+                n += read
+        if decoder is not None:
+            URL._finish_decoder(decoder, parts)
+            return b"".join(parts), trailers
+        return bytes(buf), trailers
+
+    @staticmethod
+    def _read_header_block(rfile):
+        """상태 라인부터 빈 줄까지의 헤더 블록을 한 번에 읽기.
+
+        readline을 줄마다 부르는 대신 peek로 버퍼에 쌓인 만큼 긁어오되,
+        b"\\r\\n\\r\\n" 종료 시퀀스까지만 정확히 소비해서 본문 바이트를
+        먹지 않음 (peek된 바이트는 버퍼에 있으므로 read가 블록되지 않음).
+        """
+        buf = bytearray()
+        while True:
+            peeked = rfile.peek(4096)
+            if not peeked:
+                # 버퍼가 비었으면 한 바이트 읽어 EOF를 감지하거나 채움
+                b = rfile.read(1)
+                if not b:
+                    raise Exception("Unexpected EOF while reading headers")
+                buf += b
+                if buf.endswith(b"\r\n\r\n"):
+                    break
+                continue
+            # 종료 시퀀스가 peek 경계에 걸칠 수 있으니 꼬리 3바이트와 합쳐 검색
+            tail_len = min(3, len(buf))
+            idx = (bytes(buf[-3:]) + peeked).find(b"\r\n\r\n") if tail_len \
+                else peeked.find(b"\r\n\r\n")
+            if idx >= 0:
+                buf += rfile.read(idx + 4 - tail_len)
+                break
+            buf += rfile.read(len(peeked))
+        return buf
+
+    @staticmethod
+    def _read_one_response(rfile):
+        """응답 하나를 읽어서 (상태코드, 설명, 헤더, 본문, 재사용 가능 여부) 리턴"""
+        # 상태 라인 + 헤더를 통째로 읽어 한 번만 디코딩
+        # (HTTP 헤더는 latin-1 범위라 iso-8859-1로 안전하게 디코딩 가능)
+        block = URL._read_header_block(rfile).decode("iso-8859-1")
+        lines = block.split("\r\n")
+
+        # 상태 라인 파싱 (예: "HTTP/1.1 200 OK")
+        version, status, explanation = lines[0].split(" ", 2)
+
+        # 나머지 줄들이 헤더 (마지막 두 개는 종료 빈 줄)
+        response_headers = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            header, _, value = line.partition(":")
+            # casefold()는 lower()보다 더 공격적인 대소문자 정규화
+            # 국제화된 문자도 올바르게 처리
+            response_headers[header.casefold()] = value.strip()
+
+        status_code = int(status)
+
+        # 1xx/204/304 응답은 본문이 없음 - 읽으려 들면 keep-alive 연결에서
+        # 다음 응답을 먹거나 타임아웃까지 블록됨
+        if status_code < 200 or status_code in (204, 304):
+            return status_code, explanation, response_headers, b"", True
+
+        # Content-Encoding에 맞는 증분 디코더 준비 (읽으면서 바로 압축 해제)
+        encoding = response_headers.get("content-encoding", "").lower()
+        decoder = URL._make_decoder(encoding)
+
+        # 본문(body) 읽기 - Transfer-Encoding: chunked 지원
+        reusable = True
+        transfer_encoding = response_headers.get("transfer-encoding", "").lower()
+        if "chunked" in transfer_encoding:
+            body, trailers = URL._read_chunked(rfile, decoder)
+            # 트레일러 헤더를 응답 헤더에 병합 (기존 헤더를 덮어쓸 수 있음)
+            for k, v in trailers.items():
+                response_headers[k] = v
+        elif "content-length" in response_headers:
+            length = int(response_headers["content-length"])
+            body = URL._read_sized(rfile, length, decoder)
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug(f"📦 Content-Length: {length} 바이트 읽음")
+        else:
+            # Content-Length가 없으면 소켓이 닫힐 때까지 읽음
+            parts = []
+            while True:
+                chunk = rfile.read(65536)
+                if not chunk:
+                    break
+                if decoder is not None:
+                    parts.append(decoder.decompress(chunk))
+                else:
+                    parts.append(chunk)
+            if decoder is not None:
+                URL._finish_decoder(decoder, parts)
+            body = b"".join(parts)
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug("⚠️  Content-Length 없음 - 소켓 닫힘")
+            reusable = False
+
+        return status_code, explanation, response_headers, body, reusable
+
+    @staticmethod
+    def _read_sized(rfile, length, decoder=None):
+        """Content-Length만큼 미리 할당한 버퍼에 readinto로 채우기.
+
+        read()가 조각마다 새 bytes를 만들고 join이 한 번 더 복사하는 대신,
+        압축 안 된 본문은 bytearray(length) 하나에 바로 받는다. 압축된
+        본문은 64KB 스크래치 버퍼를 재사용하며 조각을 즉시 해제한다.
+        """
+        if decoder is None:
+            buf = bytearray(length)
+            off = 0
+            with memoryview(buf) as mv:
+                while off < length:
+                    n = rfile.readinto(mv[off:])
+                    if not n:
+                        break
+                    off += n
+            if off < length:
+                # 짧게 읽힘 (연결이 일찍 닫힌 경우)
+                del buf[off:]
+            return bytes(buf)
+
+        parts = []
+        scratch = bytearray(min(65536, length))
+        remaining = length
+        with memoryview(scratch) as mv:
+            while remaining > 0:
+                n = rfile.readinto(mv[:min(len(scratch), remaining)])
+                if not n:
+                    break
+                parts.append(decoder.decompress(mv[:n]))
+                remaining -= n
+        URL._finish_decoder(decoder, parts)
+        return b"".join(parts)
+
+    @classmethod
+    def request_many(cls, urls):
+        """같은 호스트의 요청들을 HTTP/1.1 파이프라인으로 처리.
+
+        URL 문자열(또는 URL 객체) 리스트를 받아 {입력값: 본문} 딕셔너리 리턴.
+        같은 (scheme, host, port) 그룹은 소켓 하나에 요청을 연속으로 쓰고
+        응답을 FIFO 순서로 읽는다. N개의 요청이 N·RTT가 아니라 ≈1·RTT에
+        처리됨. http/https가 아니거나 파이프라인을 못 쓰는 응답(Connection:
+        close 등)이 나오면 남은 요청은 개별 request()로 처리.
+        """
+        results = {}
+        groups = {}
+        for key in urls:
+            url = key if isinstance(key, cls) else cls(key)
+            if getattr(url, 'scheme', None) in ("http", "https"):
+                groups.setdefault((url.scheme, url.host, url.port), []).append((key, url))
             else:
-                # percent-decoded bytes
-                data_bytes = unquote_to_bytes(data)
-            # store for request()
-            self.data_bytes = data_bytes
-            self.data_mediatype = mediatype
-            self.data_charset = charset
-        elif self.scheme == "view-source":
-            # view-source:<inner-uri> -> store inner URL object to fetch its source
-            # extract the remainder after the first ':' (preserve // for http/https)
-            inner_uri = url[len('view-source:'):]
-            # allow whitespace tolerance
-            inner_uri = inner_uri.strip()
-            # create URL object for inner resource
-            self.inner = URL(inner_uri)
+                results[key] = url.request()
+        for pool_key, entries in groups.items():
+            cls._pipeline_group(pool_key, entries, results)
+        return results
+
+    @classmethod
+    def _pipeline_group(cls, pool_key, entries, results):
+        """한 호스트로 가는 요청 그룹을 파이프라인으로 처리"""
+        # 콘텐츠 캐시 히트는 네트워크를 타지 않음
+        pending = []
+        for key, url in entries:
+            if url._is_cacheable_flag:
+                cached = URL._get_from_cache(url._full_url)
+                if cached:
+                    if _log.isEnabledFor(logging.DEBUG):
+                        _log.debug(f"⚡ 캐시에서 반환: {url._full_url}")
+                    # 캐시 본문은 bytes - 네트워크 경로와 같은 str로 디코딩
+                    results[key] = cached['body'].decode(
+                        cached.get('charset', 'utf8'), errors="replace")
+                    continue
+            pending.append((key, url))
+        if not pending:
+            return
+        if len(pending) == 1:
+            key, url = pending[0]
+            results[key] = url.request()
+            return
+
+        scheme, host, port = pool_key
+        s = URL._acquire(pool_key)
+        if s is None:
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug(f"🔌 새 연결 생성: {scheme}://{host}:{port}")
+            s = URL._connect(host, port)
+            if scheme == "https":
+                ctx = URL._get_ssl_context()
+                s = ctx.wrap_socket(s, server_hostname=host)
         else:
-            raise AssertionError(f"Unknown scheme {self.scheme}")
-    
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug(f"♻️  기존 연결 재사용: {scheme}://{host}:{port}")
+
+        # 요청들을 전부 이어서 한 번에 전송
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug(f"🚄 파이프라인 요청 {len(pending)}개: {scheme}://{host}:{port}")
+        s.sendall(b"".join(url._build_request_bytes() for _, url in pending))
+
+        response = s.makefile("rb")
+        broken = False
+        for i, (key, url) in enumerate(pending):
+            if broken:
+                # 연결이 끊겼으면 남은 요청은 개별 처리
+                results[key] = url.request()
+                continue
+            try:
+                status_code, explanation, headers, body, reusable = \
+                    URL._read_one_response(response)
+            except Exception:
+                broken = True
+                try:
+                    s.close()
+                except Exception:
+                    pass
+                results[key] = url.request()
+                continue
+
+            if "close" in headers.get("connection", "").lower() or not reusable:
+                broken = True
+
+            if status_code != 200:
+                # 리다이렉트 등은 request()의 기존 로직에 맡김
+                results[key] = url.request()
+                continue
+
+            # 캐시 저장 (request()와 동일한 규칙 - bytes 그대로)
+            if url._is_cacheable_flag:
+                no_store, no_cache, max_age = URL._parse_cache_control(
+                    headers.get('cache-control', ''))
+                if not no_store:
+                    URL._save_to_cache(url._full_url, body, headers,
+                                       max_age, no_cache)
+
+            charset = URL._charset_from_headers(headers)
+            results[key] = body.decode(charset, errors="replace")
+
+        if broken:
+            try:
+                s.close()
+            except Exception:
+                pass
+        else:
+            URL._release(pool_key, s)
+
+    @staticmethod
+    def _charset_from_headers(headers):
+        """Content-Type 헤더에서 charset 추출 (없으면 utf8)"""
+        content_type = headers.get('content-type', '')
+        for part in content_type.split(';')[1:]:
+            k, _, v = part.strip().partition('=')
+            if k.lower() == 'charset' and v:
+                return v.strip('"\'').lower()
+        return 'utf8'
+
     def request(self, redirects: int = 5, redirect_log=None):
-        """서버에 HTTP 요청을 보내고 응답을 받는 함수"""
+        """서버에 HTTP 요청을 보내고 응답을 텍스트로 받는 함수.
+
+        request_bytes()의 얇은 래퍼 - 디코딩은 여기서 딱 한 번만 수행.
+        """
+        body, charset = self.request_bytes(redirects=redirects,
+                                           redirect_log=redirect_log)
+        try:
+            # str(buffer, ...)는 bytes뿐 아니라 mmap 등 버퍼도 복사 없이 디코딩
+            return str(body, charset, errors='replace')
+        except LookupError:
+            # 서버가 보낸 charset 이름이 파이썬에 없는 경우
+            return str(body, 'utf8', errors='replace')
+
+    def request_bytes(self, redirects: int = 5, redirect_log=None):
+        """서버에 HTTP 요청을 보내고 (본문 bytes, charset) 리턴.
+
+        디코딩을 소비자 쪽 경계로 미루면 본문 전체를 한 번 더 훑는
+        decode 패스를 중복 수행하지 않음 (캐시/해시는 bytes로 바로 처리).
+        """
         # redirect_log 초기화 (최상위 호출자가 None을 주면 여기서 생성하고
         # 최종 결과 직전에 로그를 출력함)
         created_local_log = False
@@ -172,261 +900,166 @@ class URL:
             # view-source:example.com의 inner는 example.com임 따라서 반드시 있어야함
             if not hasattr(self, 'inner'):
                 raise ValueError('view-source missing inner URL')
-            body = self.inner.request(redirects=redirects, redirect_log=redirect_log)
-            return body
+            return self.inner.request_bytes(redirects=redirects, redirect_log=redirect_log)
         # data 스킴이면 URI에 포함된 데이터를 반환
         if getattr(self, 'scheme', None) == 'data':
-            # Determine charset to decode bytes to text
-            charset = self.data_charset or ("utf-8" if self.data_mediatype.startswith("text/") else "utf-8")
-            try:
-                return self.data_bytes.decode(charset, errors='replace')
-            except Exception:
-                return self.data_bytes.decode('utf-8', errors='replace')
+            charset = self.data_charset or "utf-8"
+            return self.data_bytes, charset
 
         # file 스킴이면 로컬 파일을 읽어서 내용을 반환
         if getattr(self, 'scheme', None) == 'file':
-            # 파일이 존재하는지 확인
-            if not os.path.exists(self.filepath):
-                raise FileNotFoundError(f"File not found: {self.filepath}")
-            with open(self.filepath, 'rb') as f:
-                data = f.read()
-                # '�� invalid utf8 �' 이처럼 변환이 됨, U+FFFD
-            return data.decode('utf8', errors='replace')
-        
-        # HTTP/HTTPS 요청에 대한 캐시 처리
-        full_url = f"{self.scheme}://{self.host}{self.path}"
+            return URL._read_file(self.filepath), 'utf8'
         
-        # 캐시 가능한 리소스인지 확인
-        is_cacheable = URL._is_cacheable(self.path)
+        # HTTP/HTTPS 요청에 대한 캐시 처리 (__init__에서 미리 계산된 값 사용)
+        full_url = self._full_url
+        is_cacheable = self._is_cacheable_flag
         
-        # 캐시 확인
+        # 캐시 확인: 신선하면 바로 반환, 낡았으면 조건부 요청으로 재검증
+        stale_entry = None
+        conditional_headers = None
         if is_cacheable:
-            cached = URL._get_from_cache(full_url)
-            if cached:
-                print(f"⚡ 캐시에서 반환: {full_url}")
-                return cached['body']
-        
-        # 1. 소켓 캐시 확인 및 재사용
-        cache_key = f"{self.scheme}://{self.host}:{self.port}"
-        s = URL._socket_cache.get(cache_key)
-        
-        # 기존 소켓이 없거나 닫혀있으면 새로 생성
+            hit = URL._lookup_cache(full_url)
+            if hit:
+                entry, fresh = hit
+                if fresh:
+                    if _log.isEnabledFor(logging.DEBUG):
+                        _log.debug(f"⚡ 캐시에서 반환: {full_url}")
+                    return entry['body'], entry.get('charset', 'utf8')
+                conditional_headers = {}
+                if entry.get('etag'):
+                    conditional_headers['If-None-Match'] = entry['etag']
+                if entry.get('last_modified'):
+                    conditional_headers['If-Modified-Since'] = entry['last_modified']
+                if conditional_headers:
+                    # 304가 오면 이 엔트리의 body를 재사용
+                    stale_entry = entry
+                else:
+                    # 검증자(ETag/Last-Modified)가 없으면 그냥 새로 받음
+                    conditional_headers = None
+
+        # 1. 연결 풀에서 유휴 소켓 확인 및 재사용
+        pool_key = (self.scheme, self.host, self.port)
+        s = URL._acquire(pool_key)
+
+        # 풀에 쓸 수 있는 소켓이 없으면 새로 생성
         if s is None:
-            print(f"🔌 새 연결 생성: {cache_key}")
-            s = socket.socket(
-                family=socket.AF_INET,      # IPv4 사용
-                type=socket.SOCK_STREAM,    # TCP 연결
-                proto=socket.IPPROTO_TCP,   # TCP 프로토콜
-            )
-            
-            # 2. 서버에 연결
-            try:
-                # set a sensible timeout for network operations
-                s.settimeout(10.0)
-                s.connect((self.host, self.port))
-            except Exception as e:
-                # Ensure socket not left in cache on failure
-                try:
-                    s.close()
-                except Exception:
-                    pass
-                raise Exception(f"Network error connecting to {self.host}:{self.port} - {e}")
-            
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug(f"🔌 새 연결 생성: {self.scheme}://{self.host}:{self.port}")
+            # 2. 서버에 연결 (캐시된 DNS + IPv6/IPv4 듀얼 스택)
+            s = URL._connect(self.host, self.port)
+
             # 3. HTTPS인 경우 TLS로 암호화
             if self.scheme == "https":
-                ctx = ssl.create_default_context()
+                ctx = URL._get_ssl_context()
                 s = ctx.wrap_socket(s, server_hostname=self.host)
-            
-            # 캐시에 저장
-            URL._socket_cache[cache_key] = s
         else:
-            print(f"♻️  기존 연결 재사용: {cache_key}")
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug(f"♻️  기존 연결 재사용: {self.scheme}://{self.host}:{self.port}")
         
         # 4. HTTP 요청 메시지 작성 (HTTP/1.1 지원, Keep-Alive)
-        # GET 메서드로 특정 경로의 리소스를 요청
-        request = "GET {} HTTP/1.1\r\n".format(self.path)
-        request += "Host: {}\r\n".format(self.host)
-        # Keep-Alive 사용 (연결 유지)
-        request += "Connection: keep-alive\r\n"
-        request += "User-Agent: Mozilla/5.0 (CustomBrowser)\r\n"
-        # 압축 지원을 서버에 알림
-        request += "Accept-Encoding: gzip, deflate, br\r\n"
-        request += "\r\n"  # 헤더의 끝을 표시
-        
-        # 5. 요청 전송 (문자열을 바이트로 변환)
-        s.send(request.encode("utf8"))
-        
+        request = self._build_request_bytes(conditional_headers)
+
+        # 5. 요청 전송 (send는 TLS 소켓에서 일부만 쓸 수 있으므로 sendall)
+        s.sendall(request)
+
         # 6. 응답 받기 (바이너리로 읽어야 압축 해제 가능)
         try:
             response = s.makefile("rb")
         except Exception as e:
-            if cache_key in URL._socket_cache:
-                del URL._socket_cache[cache_key]
             s.close()
             raise Exception(f"Failed to read response from {self.host}:{self.port} - {e}")
-        
-        # 7. 상태 라인 읽기 (예: "HTTP/1.0 200 OK")
-        statusline = response.readline().decode("utf8")
-        version, status, explanation = statusline.split(" ", 2)
-        
-        # 8. 응답 헤더 읽기 (빈 줄이 나올 때까지)
-        response_headers = {}
-        while True:
-            line = response.readline().decode("utf8")
-            if line == "\r\n": break  # 헤더의 끝
-            header, value = line.split(":", 1)
-            # casefold()는 lower()보다 더 공격적인 대소문자 정규화
-            # 국제화된 문자도 올바르게 처리
-            response_headers[header.casefold()] = value.strip()
-        
-        # 9. HTTP 상태 확인 및 리다이렉트 처리
-        status_code = int(status)
+
+        # 7-10. 상태 라인/헤더/본문 읽기 (파이프라인 요청과 공용 헬퍼)
+        status_code, explanation, response_headers, body, reusable = \
+            URL._read_one_response(response)
+
+        # Connection 헤더 확인하여 소켓 반납 여부 결정
+        connection_header = response_headers.get("connection", "").lower()
+        if not reusable or "close" in connection_header:
+            if reusable and _log.isEnabledFor(logging.DEBUG):
+                _log.debug("🔌 서버가 연결 종료 요청 - 소켓 닫기")
+            s.close()
+        else:
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug("✅ 연결 유지 (Keep-Alive) - 풀에 반납")
+            URL._release(pool_key, s)
+
+        # 304 Not Modified: 캐시 본문이 아직 유효 - 타임스탬프만 갱신
+        if status_code == 304 and stale_entry is not None:
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug(f"🔁 304 Not Modified - 캐시 재검증 성공: {full_url}")
+            stale_entry['timestamp'] = time.time()
+            # 서버가 갱신된 캐시 지시자를 보냈으면 반영
+            cache_control = response_headers.get('cache-control', '')
+            if cache_control:
+                no_store, no_cache, max_age = URL._parse_cache_control(cache_control)
+                stale_entry['max_age'] = max_age
+                stale_entry['no_cache'] = no_cache
+            return stale_entry['body'], stale_entry.get('charset', 'utf8')
+
         # 리다이렉트(3xx) 처리: Location 헤더가 있으면 따라간다
         if 300 <= status_code < 400:
             if redirects <= 0:
                 raise Exception('Too many redirects')
             loc = response_headers.get('location')
             if loc:
-                # 절대/상대 URL 모두 처리
-                base = f"{self.scheme}://{self.host}{self.path}"
-                new_uri = urljoin(base, loc)
+                base = self._full_url
+                # 이미 절대 URL이면 (흔한 경우) urljoin 생략
+                if loc.startswith(('http://', 'https://')):
+                    new_uri = loc
+                else:
+                    new_uri = urljoin(base, loc)
                 # 로그에 현재->새 URL 기록
                 redirect_log.append((base, new_uri))
-                # 리다이렉트 시 소켓 캐시에서 제거하고 닫기
-                if cache_key in URL._socket_cache:
-                    del URL._socket_cache[cache_key]
-                s.close()
                 # Don't return immediately — call inner request and then
                 # let this frame finish so it can print the redirect trace
-                body = URL(new_uri).request(redirects=redirects-1, redirect_log=redirect_log)
+                result = URL(new_uri).request_bytes(redirects=redirects-1, redirect_log=redirect_log)
                 if created_local_log and redirect_log:
-                    print("Redirect trace:")
+                    if _log.isEnabledFor(logging.DEBUG):
+                        _log.debug("Redirect trace:")
                     for i, (src, dst) in enumerate(redirect_log, 1):
-                        print(f" {i}. {src} -> {dst}")
-                return body
+                        if _log.isEnabledFor(logging.DEBUG):
+                            _log.debug(f" {i}. {src} -> {dst}")
+                return result
             # Location이 없으면 계속 진행하여 에러 처리
         assert status_code == 200, "{}: {}".format(status_code, explanation)
 
-        # 10. 본문(body) 읽기 - Transfer-Encoding: chunked 지원
-        transfer_encoding = response_headers.get("transfer-encoding", "").lower()
+        # 13. 디코딩은 하지 않음 - 소비자가 charset으로 한 번만 디코딩
+        charset = URL._charset_from_headers(response_headers)
 
-        def read_chunked(rfile):
-            chunks = []
-            trailers = {}
-            while True:
-                # 청크 크기 라인 읽기
-                line = rfile.readline().decode("ascii")
-                if not line:
-                    raise Exception("Unexpected EOF while reading chunk size")
-                line = line.strip()
-                # 사이즈 파싱 (세미콜론 뒤의 익스텐션 무시)
-                size_str = line.split(';', 1)[0]
-                try:
-                    size = int(size_str, 16)
-                except ValueError:
-                    raise Exception(f"Invalid chunk size: {size_str}")
-                if size == 0:
-                    # 트레일러 헤더(있다면) 읽기: 빈 줄 전까지 헤더 라인들
-                    while True:
-                        trailer_line = rfile.readline().decode("utf8")
-                        if trailer_line in ("\r\n", "\n", ""):
-                            break
-                        if ":" in trailer_line:
-                            h, v = trailer_line.split(":", 1)
-                            trailers[h.casefold()] = v.strip()
-                    break
-                data = rfile.read(size)
-                chunks.append(data)
-                # 청크 끝의 CRLF 소비
-                rfile.read(2)
-            return b"".join(chunks), trailers
-
-        if "chunked" in transfer_encoding:
-            body, trailers = read_chunked(response)
-            # 트레일러 헤더를 응답 헤더에 병합 (기존 헤더를 덮어쓸 수 있음)
-            for k, v in trailers.items():
-                response_headers[k] = v
-        else:
-            # Content-Length 헤더를 사용하여 정확한 바이트 수만 읽기
-            if "content-length" in response_headers:
-                length = int(response_headers["content-length"])
-                body = response.read(length)
-                print(f"📦 Content-Length: {length} 바이트 읽음")
-            else:
-                # Content-Length가 없으면 소켓이 닫힐 때까지 읽음
-                body = response.read()
-                print("⚠️  Content-Length 없음 - 소켓 닫힘")
-                # 캐시에서 제거하고 소켓 닫기
-                if cache_key in URL._socket_cache:
-                    del URL._socket_cache[cache_key]
-                s.close()
-        
-        # Connection 헤더 확인하여 소켓 유지 여부 결정
-        connection_header = response_headers.get("connection", "").lower()
-        if "close" in connection_header:
-            print("🔌 서버가 연결 종료 요청 - 소켓 닫기")
-            if cache_key in URL._socket_cache:
-                del URL._socket_cache[cache_key]
-            s.close()
-        else:
-            print("✅ 연결 유지 (Keep-Alive)")
-        
-        # 12. Content-Encoding에 따라 압축 해제
-        encoding = response_headers.get("content-encoding", "").lower()
-        
-        if encoding == "gzip":
-            print("🗜️  gzip 압축 해제 중...")
-            body = gzip.decompress(body)
-        elif encoding == "deflate":
-            print("🗜️  deflate 압축 해제 중...")
-            try:
-                # deflate는 두 가지 형식이 있음 (zlib 헤더 있음/없음)
-                body = zlib.decompress(body)
-            except zlib.error:
-                # zlib 헤더가 없는 경우 raw deflate 시도
-                body = zlib.decompress(body, -zlib.MAX_WBITS)
-        elif encoding == "br":
-                body = brotli.decompress(body)
-        elif encoding:
-            # 알 수 없는 인코딩
-            raise Exception(f"Unsupported content-encoding: {encoding}")
-        else:
-            print("📄 압축 없음")
-        
-        # 13. 바이트를 문자열로 변환
-        body = body.decode("utf8", errors="replace")
-        
         # 14. 캐시 저장 (200 OK 응답이고 캐시 가능한 리소스인 경우)
         if status_code == 200 and is_cacheable:
             cache_control = response_headers.get('cache-control', '')
-            no_store, max_age = URL._parse_cache_control(cache_control)
-            
+            no_store, no_cache, max_age = URL._parse_cache_control(cache_control)
+
             if not no_store:
-                # no-store가 아니면 캐시에 저장
-                URL._save_to_cache(full_url, body, response_headers, max_age)
+                # no-store가 아니면 캐시에 저장 (bytes 그대로)
+                URL._save_to_cache(full_url, body, response_headers, max_age, no_cache)
             else:
-                print(f"🚫 캐시 금지 (no-store): {full_url}")
+                if _log.isEnabledFor(logging.DEBUG):
+                    _log.debug(f"🚫 캐시 금지 (no-store): {full_url}")
 
         # If we created the redirect_log in this call and there are entries,
         # print the redirect trace for non-view-source requests as well.
         if created_local_log and redirect_log:
-            print("Redirect trace:")
-            for i, (src, dst) in enumerate(redirect_log, 1):
-                print(f" {i}. {src} -> {dst}")
+            _log.info("Redirect trace:\n%s", "\n".join(
+                f" {i}. {src} -> {dst}"
+                for i, (src, dst) in enumerate(redirect_log, 1)))
 
-        return body
+        return body, charset
 
 
-# Ensure sockets in the socket cache are closed on program exit
-def _close_socket_cache():
-    for key, s in list(URL._socket_cache.items()):
-        try:
-            s.close()
-        except Exception:
-            pass
-    URL._socket_cache.clear()
+# Ensure pooled sockets are closed on program exit
+def _close_socket_pool():
+    for key, pool in list(URL._socket_pool.items()):
+        for s, last_used in pool:
+            try:
+                s.close()
+            except Exception:
+                pass
+    URL._socket_pool.clear()
 
-atexit.register(_close_socket_cache)
+atexit.register(_close_socket_pool)
 
 
 
@@ -0,0 +1,181 @@
+# cli.py - Chapter 1: 텍스트 모드 브라우저 (README의 lab1/cli 실행 예시용)
+import sys
+import re
+import html
+import asyncio
+import hashlib
+from collections import OrderedDict
+
+from URL import URL
+from Browser import HTMLParser, Text, BLOCK_ELEMENTS
+
+# 태그 제거용 정규식 (모듈 로드 시 한 번만 컴파일)
+# 문자 하나씩 보며 print(c, end="")를 호출하는 대신 C 레벨 한 번의 패스로
+# 태그를 전부 제거하고 출력도 write() 한 번으로 끝냄
+_TAG_RE = re.compile(r'<[^>]*>')
+
+
+def show(body):
+    """HTML 태그를 제거하고 텍스트만 출력"""
+    text = _TAG_RE.sub('', body)
+    # &lt; &amp; 같은 엔티티 복원
+    text = html.unescape(text)
+    sys.stdout.write(text)
+
+
+# 렌더링 결과 캐시: 본문 해시 -> (파싱된 트리, 렌더링된 텍스트)
+# 대화형 모드에서 같은 URL을 다시 열면 파싱/렌더링을 건너뜀 (LRU, 최대 32개)
+_TREE_CACHE_MAX = 32
+_tree_cache = OrderedDict()
+
+
+def render_text(body, charset='utf8'):
+    """HTML을 파싱해서 텍스트로 렌더링 (같은 본문은 캐시에서 바로 반환)
+
+    body는 bytes 그대로 받음 - 해시는 bytes로 바로 계산하고
+    디코딩은 캐시 미스일 때 딱 한 번만 수행.
+    """
+    if isinstance(body, str):
+        # 이전 호출 규약(텍스트) 호환
+        body = body.encode('utf8', 'replace')
+        charset = 'utf8'
+    key = hashlib.blake2b(body, digest_size=16).digest()
+    hit = _tree_cache.get(key)
+    if hit is not None:
+        _tree_cache.move_to_end(key)
+        return hit[1]
+
+    try:
+        # str(buffer, ...)는 bytes 외에 mmap 같은 버퍼도 디코딩 가능 (큰 file://)
+        text_body = str(body, charset, errors='replace')
+    except LookupError:
+        text_body = str(body, 'utf8', errors='replace')
+    tree = HTMLParser(text_body).parse()
+    text = _walk_text(tree)
+    _tree_cache[key] = (tree, text)
+    if len(_tree_cache) > _TREE_CACHE_MAX:
+        _tree_cache.popitem(last=False)
+    return text
+
+
+# 태그별 동작 테이블: 노드마다 멤버십 검사 두 번 대신 dict 조회 한 번
+# (파서가 태그를 이미 소문자로 정규화하므로 여기서 .lower() 불필요)
+_SKIP_SUBTREE = 0   # script/style: 하위 트리 전체를 본문에서 제외
+_EMIT_NEWLINE = 1   # 블록 요소: 줄바꿈 하나 추가하고 계속 순회
+_TAG_ACTIONS = dict.fromkeys(BLOCK_ELEMENTS, _EMIT_NEWLINE)
+_TAG_ACTIONS["script"] = _SKIP_SUBTREE
+_TAG_ACTIONS["style"] = _SKIP_SUBTREE
+
+_NL = "\n"  # 줄바꿈 센티널 (매번 새 문자열 리터럴 평가 방지)
+
+
+def _walk_text(tree):
+    """DOM 트리를 순회하며 텍스트 조각을 모아서 한 번에 join"""
+    parts = []
+    stack = [tree]
+    actions = _TAG_ACTIONS
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Text):
+            parts.append(node.text)
+            continue
+        action = actions.get(node.tag)
+        if action == _SKIP_SUBTREE:
+            # 코드는 본문 텍스트가 아님
+            continue
+        if action == _EMIT_NEWLINE:
+            parts.append(_NL)
+        stack.extend(reversed(node.children))
+    return html.unescape("".join(parts))
+
+
+def load(url):
+    """URL의 내용을 받아서 텍스트로 출력"""
+    # bytes로 받아서 디코딩 횟수를 최소화 (request()는 텍스트 호환용 래퍼)
+    body, charset = url.request_bytes()
+    if getattr(url, 'scheme', None) == 'view-source':
+        # view-source는 태그 제거 없이 원본 바이트 그대로 출력
+        sys.stdout.buffer.write(body)
+        sys.stdout.flush()
+    else:
+        sys.stdout.write(render_text(body, charset))
+
+
+def _fetch_group(urls):
+    """같은 호스트로 가는 URL들을 한 워커에서 순서대로 받음.
+
+    그룹 내에서는 직렬로 처리해서 풀의 keep-alive 소켓을 그대로 재사용.
+    출력은 하지 않고 결과만 모아서 리턴 (출력 순서는 호출자가 결정).
+    """
+    out = []
+    for u in urls:
+        try:
+            body, charset = u.request_bytes()
+            out.append((u, body, charset, None))
+        except Exception as e:
+            out.append((u, None, None, e))
+    return out
+
+
+async def _load_many(raw_urls):
+    """여러 URL을 호스트별로 묶어 동시에 받고, 입력 순서대로 출력.
+
+    독립적인 호스트들은 서로를 기다리지 않으므로 배치 전체 시간이
+    sum(t_i)가 아니라 max(t_i)에 가까워짐.
+    """
+    loop = asyncio.get_running_loop()
+    order = []
+    groups = {}
+    for raw in raw_urls:
+        u = URL(raw)
+        key = (getattr(u, 'scheme', None),
+               getattr(u, 'host', None),
+               getattr(u, 'port', None))
+        groups.setdefault(key, []).append(u)
+        order.append(u)
+
+    # URL.request_bytes는 블로킹이므로 호스트 그룹마다 워커 스레드 하나
+    futures = [loop.run_in_executor(None, _fetch_group, g)
+               for g in groups.values()]
+    results = {}
+    for fetched in await asyncio.gather(*futures):
+        for u, body, charset, err in fetched:
+            results[id(u)] = (body, charset, err)
+
+    for u in order:
+        body, charset, err = results[id(u)]
+        if err is not None:
+            print(f"오류: {err}")
+        elif getattr(u, 'scheme', None) == 'view-source':
+            sys.stdout.buffer.write(body)
+            sys.stdout.flush()
+        else:
+            sys.stdout.write(render_text(body, charset))
+
+
+def main():
+    if len(sys.argv) > 2:
+        # URL 여러 개: 호스트별로 묶어 동시에 받기
+        asyncio.run(_load_many(sys.argv[1:]))
+        return
+    if len(sys.argv) > 1:
+        load(URL(sys.argv[1]))
+        return
+
+    # 대화형 모드: URL을 한 줄씩 입력받아 처리 ('quit' 입력 시 종료)
+    while True:
+        try:
+            line = input("URL> ").strip()
+        except EOFError:
+            break
+        if not line or line == "quit":
+            break
+        try:
+            load(URL(line))
+            print()
+        except Exception as e:
+            print(f"오류: {e}")
+
+
+if __name__ == "__main__":
+    main()